@@ -10,10 +10,9 @@ from components.market_performance import render_market_performance
 from components.sku_table import render_sku_table
 from components.price_calculator import render_price_calculator
 import config
-import uvicorn
-import backend
 from services.sellout_kpis import get_sellout_kpis
 from services.market_performance import get_brand_yearly_stats, get_category_brand_units
+from services.artifact_prefetch import start_prefetch
 
 # Page configuration
 st.set_page_config(
@@ -36,6 +35,8 @@ def start_backend():
     """Start the FastAPI backend server in a separate thread"""
     if not st.session_state.backend_started:
         try:
+            import uvicorn
+            import backend
             print(f"Starting backend on port {config.API_PORT}")
             
             def run_backend():
@@ -50,8 +51,13 @@ def start_backend():
             st.session_state.backend_started = True
 
 
-# Start backend
-start_backend()
+# Start backend (in "standalone" mode it runs as its own process group, see entrypoint.sh)
+if config.BACKEND_MODE == "embedded":
+    start_backend()
+
+# Download the XGBoost artifacts in the background (once per process) for the Prediction page
+if config.WARMUP_ON_STARTUP:
+    start_prefetch()
 
 
 def preload_section_data():
@@ -1,17 +1,92 @@
 """
 FastAPI backend server for price prediction
 """
-from fastapi import FastAPI, HTTPException
+import asyncio
+import base64
+import itertools
+import json
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Set, Tuple
+from collections import defaultdict
+import pandas as pd
 import uvicorn
 from services.data_service import DataService
 from services.azure_model_service import AzureModelService
-from ml.lstm_model import LSTMModel
+from services.training_service import TrainingService, TrainingJob
+from services.executors import run_io, run_cpu, run_download, shutdown_executors
+from services.readiness import ReadinessTracker
+from services.metrics import PREDICT_STAGE_SECONDS, PREDICT_REQUESTS_TOTAL, render_metrics
+from services import db, run_model
+from services.prediction_cache import PredictionCache
+from utils.singleflight import AsyncSingleFlight
+from ml.model_registry import ModelRegistry, KEY_FUNCTIONS, series_key
 import config
 
-app = FastAPI(title="Whirlpool Price Prediction API")
+logger = logging.getLogger(__name__)
+
+# Initialize services
+data_service = DataService()
+azure_model_service = AzureModelService()
+fallback_models = ModelRegistry(  # Per-series fallback models
+    model_dir=config.FALLBACK_MODEL_DIR,
+    memory_budget_bytes=config.FALLBACK_MODEL_MEMORY_MB * 1024 * 1024,
+    key_fn=KEY_FUNCTIONS.get(config.FALLBACK_MODEL_KEY, series_key),
+)
+training_service = TrainingService()
+prediction_cache = PredictionCache()
+prediction_flight = AsyncSingleFlight()
+readiness = ReadinessTracker()
+# Background model reloads (referenced so they are not garbage collected mid-flight)
+reload_tasks: Set["asyncio.Task"] = set()
+
+# model_version reported when the local LSTM fallback served a prediction
+FALLBACK_MODEL_VERSION = "fallback"
+
+
+async def warm_up():
+    """
+    Load everything the first requests need, in parallel:
+    every partner model, the DB connection pool and the XGBoost artifacts.
+    """
+    # Partner models have a fallback; the XGBoost artifacts (and the DB when it is the data source) do not
+    readiness.register("training_partners", required=False)
+    readiness.register("db_pool", required=config.DATA_SOURCE_TYPE.lower() == "database")
+    for name in run_model.FINAL_ARTIFACTS:
+        readiness.register(name)
+    
+    partners = await run_download(readiness.track, "training_partners", azure_model_service.list_available_partners) or []
+    partner_artifacts = {f"partner_model:{partner}": partner for partner in partners}
+    for name in partner_artifacts:
+        readiness.register(name, required=False)
+    
+    loads = [run_io(readiness.track, "db_pool", db.ping)]
+    loads += [
+        run_download(readiness.track, name, lambda name=name: run_model.load_final_artifact(name))
+        for name in run_model.FINAL_ARTIFACTS
+    ]
+    loads += [
+        run_download(readiness.track, name, lambda partner=partner: azure_model_service.load_model(partner))
+        for name, partner in partner_artifacts.items()
+    ]
+    await asyncio.gather(*loads)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the warm-up in the background so / answers immediately; /ready tracks it"""
+    warm_up_task = asyncio.create_task(warm_up()) if config.WARMUP_ON_STARTUP else None
+    yield
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+    shutdown_executors()
+
+
+app = FastAPI(title="Whirlpool Price Prediction API", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -22,11 +97,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize services
-data_service = DataService()
-azure_model_service = AzureModelService()
-lstm_model = LSTMModel()  # Fallback model
-
 
 class PredictionRequest(BaseModel):
     sku: str
@@ -42,19 +112,191 @@ class PredictionResponse(BaseModel):
     price: float
     release_date: str
     confidence: float = 0.85
+    # Partner model version that served the prediction ("fallback" for the local LSTM)
+    model_version: Optional[str] = None
+
+
+class BatchPredictionItem(BaseModel):
+    sku: str
+    region: str
+    partner: str = "Walmart"
+
+
+class BatchPredictionRequest(BaseModel):
+    items: List[BatchPredictionItem]
+    time_range: str
+
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[PredictionResponse]
+
+
+class SweepPair(BaseModel):
+    sku: str
+    tp: str
+
+
+class SweepRequest(BaseModel):
+    pairs: List[SweepPair]
+    grid: Dict[str, List[float]]
+
+
+class SweepResponse(BaseModel):
+    scenarios: int
+    columns: Dict[str, List[Any]]
+
+
+def _train_fallback_model(sku: str, region: str, training_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Train the fallback LSTM serving a SKU/region and swap it into the registry.
+    Requests keep using the previous model until the swap happens.
+    """
+    model = fallback_models.train(sku, region, training_data)
+    return {"sku": sku, "region": region, "trained": model.is_trained, "samples": len(training_data)}
+
+
+def _schedule_fallback_training(sku: str, region: str, training_data: List[Dict[str, Any]]) -> TrainingJob:
+    """Queue background training for a registry key (deduplicated while queued/running)"""
+    return training_service.submit(
+        ("lstm", fallback_models.key_for(sku, region)),
+        lambda: _train_fallback_model(sku, region, training_data),
+        description=f"Fallback LSTM for {sku}/{region}",
+    )
 
 
 @app.get("/")
-def root():
+async def root():
     """Health check endpoint"""
     return {"status": "ok", "message": "Whirlpool Price Prediction API"}
 
 
+@app.get("/ready")
+async def ready():
+    """
+    Readiness endpoint: per-artifact load state and timings of the startup warm-up
+    
+    Returns:
+        Readiness report (HTTP 503 while artifacts are still loading or a required one failed)
+    """
+    report = readiness.snapshot()
+    return JSONResponse(content=report, status_code=200 if report["ready"] else 503)
+
+
+def _prediction_cache_key(request: PredictionRequest, watermark: Optional[str], model_version: Optional[str]) -> Tuple:
+    """Cache key: request inputs plus the partner model version and training data watermark"""
+    return (
+        request.sku,
+        request.region,
+        request.partner,
+        request.time_range,
+        model_version,
+        watermark,
+    )
+
+
+def _record_predictions(rows: List[Tuple[str, str, str, float]]):
+    """Add (sku, region, partner, price) rows to the prediction history (blocking; run in the I/O pool)"""
+    source = data_service.get_data_source()
+    if hasattr(source, 'add_price_prediction'):
+        for sku, region, partner, price in rows:
+            source.add_price_prediction(sku, region, partner, price)
+
+
+async def _partner_handle(partner: str):
+    """Handle serving a partner: straight from memory, or loaded in the download pool"""
+    handle = azure_model_service.cached_handle(partner)
+    if handle is not None:
+        return handle
+    return await run_download(azure_model_service.load_handle, partner)
+
+
+async def _compute_prediction(request: PredictionRequest) -> PredictionResponse:
+    """
+    Fetch training data and run inference for a single prediction request
+    
+    Args:
+        request: Prediction request with SKU, region, time_range, partner
+        
+    Returns:
+        Prediction response with price and metadata
+    """
+    # Get training data for this SKU/region
+    with PREDICT_STAGE_SECONDS.time(stage="training_data"):
+        training_data = await run_io(data_service.get_training_data, request.sku, request.region)
+    
+    if not training_data:
+        raise HTTPException(status_code=404, detail="No training data available")
+    
+    # Extract historical prices
+    historical_prices = [item['price'] for item in training_data]
+    
+    # Try to load partner-specific model from Azure
+    predicted_price = None
+    model_version = FALLBACK_MODEL_VERSION
+    try:
+        with PREDICT_STAGE_SECONDS.time(stage="model_load"):
+            # The handle pins one model version for the whole request, even if a reload swaps it
+            handle = await _partner_handle(request.partner)
+        partner_model = handle.model
+        
+        # Use the loaded model for prediction
+        if hasattr(partner_model, 'predict'):
+            with PREDICT_STAGE_SECONDS.time(stage="inference"):
+                predicted_price = await run_cpu(
+                    partner_model.predict, request.sku, request.region, historical_prices
+                )
+            model_version = handle.version
+        else:
+            # If model doesn't have predict method, use fallback
+            with PREDICT_STAGE_SECONDS.time(stage="fallback_model_load"):
+                fallback_model = await run_io(fallback_models.get, request.sku, request.region)
+            with PREDICT_STAGE_SECONDS.time(stage="inference"):
+                predicted_price = await run_cpu(
+                    fallback_model.predict, request.sku, request.region, historical_prices
+                )
+    except Exception as azure_error:
+        # Fallback to the series' local LSTM model if Azure model fails; training runs
+        # in the background and this request uses the last good model (or the trend fallback)
+        with PREDICT_STAGE_SECONDS.time(stage="fallback_model_load"):
+            fallback_model = await run_io(fallback_models.get, request.sku, request.region)
+        if len(historical_prices) >= 10 and not fallback_model.is_trained:
+            _schedule_fallback_training(request.sku, request.region, training_data)
+        with PREDICT_STAGE_SECONDS.time(stage="fallback_inference"):
+            predicted_price = await run_cpu(
+                fallback_model.predict, request.sku, request.region, historical_prices
+            )
+    
+    return PredictionResponse(
+        sku=request.sku,
+        region=request.region,
+        partner=request.partner,
+        price=round(predicted_price, 2),
+        release_date=training_data[-1]['date'] if training_data else "2024-01-15T10:30:00",
+        confidence=0.85,
+        model_version=model_version
+    )
+
+
+async def _compute_cached_prediction(request: PredictionRequest, watermark: Optional[str]) -> PredictionResponse:
+    """
+    Compute a prediction and store it in the result cache under the model version that served it.
+    Fallback answers are not cached, so the partner model is tried again once it is available.
+    """
+    response = await _compute_prediction(request)
+    if response.model_version != FALLBACK_MODEL_VERSION:
+        prediction_cache.set(_prediction_cache_key(request, watermark, response.model_version), response)
+    return response
+
+
 @app.post("/api/predict", response_model=PredictionResponse)
-def predict_price(request: PredictionRequest):
+async def predict_price(request: PredictionRequest):
     """
     Predict price using partner-specific LSTM model from Azure
     
+    Partner model results are cached by inputs, serving model version and
+    training data watermark, so repeated runs skip the data fetch and inference.
+    Fallback results are not cached.
+    
     Args:
         request: Prediction request with SKU, region, time_range, partner
         
@@ -62,73 +304,322 @@ def predict_price(request: PredictionRequest):
         Prediction response with price and metadata
     """
     try:
-        # Get training data for this SKU/region
-        training_data = data_service.get_training_data(request.sku, request.region)
+        with PREDICT_STAGE_SECONDS.time(stage="cache_lookup"):
+            watermark = await run_io(data_service.get_training_data_watermark, request.sku, request.region)
+            serving_version = azure_model_service.get_model_version(request.partner)
+            cache_key = _prediction_cache_key(request, watermark, serving_version)
+            # Nothing is cached under an unloaded model (None) version
+            response = prediction_cache.get(cache_key) if serving_version is not None else None
+        if response is None:
+            # Identical concurrent requests share one computation
+            response = await prediction_flight.do(
+                cache_key, lambda: _compute_cached_prediction(request, watermark)
+            )
         
-        if not training_data:
-            raise HTTPException(status_code=404, detail="No training data available")
+        # Add to history
+        with PREDICT_STAGE_SECONDS.time(stage="history_write"):
+            await run_io(
+                _record_predictions,
+                [(request.sku, request.region, request.partner, response.price)],
+            )
         
-        # Extract historical prices
-        historical_prices = [item['price'] for item in training_data]
+        PREDICT_REQUESTS_TOTAL.inc(outcome="ok")
+        return response
+    except Exception as e:
+        PREDICT_REQUESTS_TOTAL.inc(outcome="error")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition of per-stage latency histograms and counters"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """
+    Get prediction cache statistics
+    
+    Returns:
+        Cache size and hit/miss/eviction counters
+    """
+    return prediction_cache.stats()
+
+
+def _predict_with_model(
+    model: Any,
+    skus: List[str],
+    regions: List[str],
+    histories: List[List[float]],
+) -> List[float]:
+    """
+    Score a group of series with one model, vectorized when the model supports it
+    
+    Args:
+        model: Partner model or fallback LSTM model
+        skus: SKU identifiers
+        regions: Region identifiers (aligned with skus)
+        histories: Historical prices for each series (aligned with skus)
         
-        # Try to load partner-specific model from Azure
-        predicted_price = None
-        try:
-            partner_model = azure_model_service.load_model(request.partner)
-            
-            # Use the loaded model for prediction
-            if hasattr(partner_model, 'predict'):
-                predicted_price = partner_model.predict(request.sku, request.region, historical_prices)
-            else:
-                # If model doesn't have predict method, use fallback
-                predicted_price = lstm_model.predict(request.sku, request.region, historical_prices)
-        except Exception as azure_error:
-            # Fallback to local LSTM model if Azure model fails
-            if len(historical_prices) >= 10:
-                lstm_model.train(training_data)
-            predicted_price = lstm_model.predict(request.sku, request.region, historical_prices)
+    Returns:
+        Predicted prices in input order
+    """
+    if hasattr(model, 'predict_batch'):
+        return [float(price) for price in model.predict_batch(skus, regions, histories)]
+    return [
+        float(model.predict(sku, region, prices))
+        for sku, region, prices in zip(skus, regions, histories)
+    ]
+
+
+def _predict_with_fallback(
+    skus: List[str],
+    regions: List[str],
+    histories: List[List[float]],
+) -> List[float]:
+    """
+    Score series with their fallback models, one vectorized call per registry key
+    
+    Args:
+        skus: SKU identifiers
+        regions: Region identifiers (aligned with skus)
+        histories: Historical prices for each series (aligned with skus)
         
-        # Add to history
-        if hasattr(data_service.get_data_source(), 'add_price_prediction'):
-            data_service.get_data_source().add_price_prediction(
-                request.sku,
-                request.region,
-                request.partner,
-                predicted_price
+    Returns:
+        Predicted prices in input order
+    """
+    positions_by_key: Dict[Any, List[int]] = defaultdict(list)
+    for idx, (sku, region) in enumerate(zip(skus, regions)):
+        positions_by_key[fallback_models.key_for(sku, region)].append(idx)
+    
+    prices: List[float] = [0.0] * len(skus)
+    for positions in positions_by_key.values():
+        first = positions[0]
+        model = fallback_models.get(skus[first], regions[first])
+        group_prices = _predict_with_model(
+            model,
+            [skus[idx] for idx in positions],
+            [regions[idx] for idx in positions],
+            [histories[idx] for idx in positions],
+        )
+        for idx, price in zip(positions, group_prices):
+            prices[idx] = price
+    return prices
+
+
+@app.post("/api/predict/batch", response_model=BatchPredictionResponse)
+async def predict_price_batch(request: BatchPredictionRequest):
+    """
+    Predict prices for many (sku, region, partner) tuples in one request
+    
+    Items are grouped by partner so each partner model is loaded once and
+    scored with a single vectorized call. Training data is fetched once per
+    distinct SKU/region pair, concurrently.
+    
+    Args:
+        request: Batch request with the items to score and the time_range
+        
+    Returns:
+        Prediction responses in the same order as the request items
+    """
+    if len(request.items) > config.MAX_BATCH_PREDICTIONS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(request.items)} items (max {config.MAX_BATCH_PREDICTIONS})"
+        )
+    
+    try:
+        # Distinct series are fetched concurrently; the I/O pool bounds how many run at once
+        series_keys = list(dict.fromkeys((item.sku, item.region) for item in request.items))
+        series_data = await asyncio.gather(*(
+            run_io(data_service.get_training_data, sku, region) for sku, region in series_keys
+        ))
+        training_by_series: Dict[Tuple[str, str], List[Dict[str, Any]]] = dict(zip(series_keys, series_data))
+        
+        missing = sorted({f"{sku}/{region}" for (sku, region), data in training_by_series.items() if not data})
+        if missing:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No training data available for: {', '.join(missing)}"
             )
         
-        return PredictionResponse(
-            sku=request.sku,
-            region=request.region,
-            partner=request.partner,
-            price=round(predicted_price, 2),
-            release_date=training_data[-1]['date'] if training_data else "2024-01-15T10:30:00",
-            confidence=0.85
+        items_by_partner: Dict[str, List[int]] = defaultdict(list)
+        for idx, item in enumerate(request.items):
+            items_by_partner[item.partner].append(idx)
+        
+        predictions: List[Optional[PredictionResponse]] = [None] * len(request.items)
+        history_rows: List[Tuple[str, str, str, float]] = []
+        for partner, positions in items_by_partner.items():
+            group = [request.items[idx] for idx in positions]
+            skus = [item.sku for item in group]
+            regions = [item.region for item in group]
+            histories = [
+                [row['price'] for row in training_by_series[(item.sku, item.region)]]
+                for item in group
+            ]
+            
+            model_version = FALLBACK_MODEL_VERSION
+            try:
+                handle = await _partner_handle(partner)
+                if hasattr(handle.model, 'predict'):
+                    prices = await run_cpu(_predict_with_model, handle.model, skus, regions, histories)
+                    model_version = handle.version
+                else:
+                    prices = await run_cpu(_predict_with_fallback, skus, regions, histories)
+            except Exception:
+                # Fallback to local LSTM models; batch requests never train inline
+                prices = await run_cpu(_predict_with_fallback, skus, regions, histories)
+            
+            for idx, item, price in zip(positions, group, prices):
+                training_data = training_by_series[(item.sku, item.region)]
+                history_rows.append((item.sku, item.region, partner, price))
+                predictions[idx] = PredictionResponse(
+                    sku=item.sku,
+                    region=item.region,
+                    partner=partner,
+                    price=round(price, 2),
+                    release_date=training_data[-1]['date'],
+                    confidence=0.85,
+                    model_version=model_version
+                )
+        
+        # One trip to the I/O pool writes the history of the whole batch
+        await run_io(_record_predictions, history_rows)
+        return BatchPredictionResponse(predictions=predictions)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/predict/sweep", response_model=SweepResponse)
+async def predict_price_sweep(request: SweepRequest):
+    """
+    What-if sweep of the final XGBoost model over GROSS_SALES / QTY / INV
+    
+    Every combination of the grid values is scored for every (sku, tp) pair
+    with a single model call.
+    
+    Args:
+        request: Pairs to score and feature -> values grid
+        
+    Returns:
+        Columnar result (one entry per pair and scenario, pairs in request order)
+    """
+    n_scenarios = len(request.pairs)
+    for values in request.grid.values():
+        n_scenarios *= len(values)
+    if n_scenarios > config.MAX_SWEEP_SCENARIOS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Sweep too large: {n_scenarios} scenarios (max {config.MAX_SWEEP_SCENARIOS})"
+        )
+    
+    try:
+        result = await run_cpu(
+            run_model.sweep_price_predictions,
+            [(pair.sku, pair.tp) for pair in request.pairs],
+            request.grid,
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if result["missing"]:
+        missing = ", ".join(f"{sku}/{tp}" for sku, tp in result["missing"])
+        raise HTTPException(status_code=404, detail=f"No history available for: {missing}")
+    
+    table_df = result["table_df"]
+    columns = {
+        name: [None if pd.isna(value) else value for value in table_df[name].tolist()]
+        for name in table_df.columns
+    }
+    return SweepResponse(scenarios=len(table_df), columns=columns)
+
+
+def _encode_history_cursor(record: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just past a history record"""
+    raw = json.dumps([record["release_date"], record["id"]])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_history_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode a cursor into a (release_date, id) position"""
+    try:
+        release_date, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(release_date), int(record_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid history cursor")
 
 
 @app.get("/api/history")
-def get_history(limit: int = 10):
+async def get_history(
+    limit: int = Query(10, ge=1, le=config.HISTORY_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sku: Optional[str] = None,
+    partner: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+):
     """
-    Get price prediction history
+    Get price prediction history, newest first
     
     Args:
-        limit: Maximum number of records to return
+        limit: Page size (json format only; ndjson streams every matching record)
+        cursor: Cursor from a previous page's next_cursor
+        sku: Optional SKU filter
+        partner: Optional partner filter
+        start_date: Optional lower bound on release date (YYYY-MM-DD)
+        end_date: Optional upper bound on release date (YYYY-MM-DD)
+        format: "json" for a page with next_cursor, "ndjson" for a streamed export
         
     Returns:
-        List of prediction history records
+        Page of history records with the cursor of the next page, or an NDJSON stream
     """
+    filters = {
+        "sku": sku,
+        "partner": partner,
+        "start_date": start_date,
+        "end_date": end_date,
+        "before": _decode_history_cursor(cursor) if cursor else None,
+    }
+    
+    if format == "ndjson":
+        records = data_service.iter_price_history(**filters)
+        
+        def next_page() -> List[Dict[str, Any]]:
+            return list(itertools.islice(records, config.HISTORY_MAX_PAGE_SIZE))
+        
+        async def stream_history():
+            # Pages are pulled through the sized I/O pool, never on the event loop
+            while True:
+                page = await run_io(next_page)
+                if not page:
+                    break
+                yield "".join(json.dumps(record) + "\n" for record in page)
+        return StreamingResponse(stream_history(), media_type="application/x-ndjson")
+    
+    def read_page() -> Dict[str, Any]:
+        # Read one extra record to know whether another page exists
+        records = list(itertools.islice(data_service.iter_price_history(**filters), limit + 1))
+        items = records[:limit]
+        has_more = len(records) > limit
+        return {
+            "items": items,
+            "next_cursor": _encode_history_cursor(items[-1]) if has_more else None,
+        }
+    
     try:
-        history = data_service.get_price_history(limit)
-        return history
+        return await run_io(read_page)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/partners")
-def get_available_partners():
+async def get_available_partners():
     """
     Get list of available training partners with models
     
@@ -136,56 +627,192 @@ def get_available_partners():
         List of partner names
     """
     try:
-        partners = azure_model_service.list_available_partners()
+        partners = await run_download(azure_model_service.list_available_partners)
         return {"partners": partners}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _reload_and_swap(partner: str) -> str:
+    """Load a partner's latest model, swap it in and drop cached predictions of older versions"""
+    handle = await run_download(azure_model_service.reload_model, partner)
+    prediction_cache.invalidate(lambda key: key[2] == partner and key[4] != handle.version)
+    return handle.version
+
+
+def _log_reload_outcome(partner: str, task: "asyncio.Task"):
+    reload_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background reload of %s failed: %s", partner, task.exception())
+
+
 @app.post("/api/reload-model")
-def reload_partner_model(partner: str):
+async def reload_partner_model(partner: str, wait: bool = False):
     """
-    Reload a partner's model from Azure (clears cache)
+    Reload a partner's model from Azure without interrupting serving
+    
+    The new version loads in the background and is swapped in atomically;
+    until then (and for requests already running) the current version serves.
     
     Args:
         partner: Partner name
+        wait: Block until the new version is serving
         
     Returns:
-        Reload status
+        Reload status with the serving version
     """
-    try:
-        azure_model_service.reload_model(partner)
-        return {"status": "success", "message": f"Model for {partner} reloaded"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    if wait:
+        try:
+            version = await _reload_and_swap(partner)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        return {"status": "success", "version": version, "message": f"Model for {partner} reloaded"}
+    
+    task = asyncio.ensure_future(_reload_and_swap(partner))
+    reload_tasks.add(task)
+    task.add_done_callback(lambda task: _log_reload_outcome(partner, task))
+    return JSONResponse(
+        status_code=202,
+        content={
+            "status": "reloading",
+            "serving_version": azure_model_service.get_model_version(partner),
+            "message": f"Loading the latest model for {partner} in the background"
+        }
+    )
+
+
+@app.get("/api/models")
+async def get_model_cache_stats():
+    """
+    Loaded partner model cache statistics
+    
+    Returns:
+        Entry count, estimated bytes vs budget, pinned partners and hit/miss/eviction counters
+    """
+    return azure_model_service.cache_stats()
+
+
+@app.post("/api/models/{partner}/pin")
+async def pin_partner_model(partner: str):
+    """
+    Keep a partner's model in memory regardless of the memory budget
+    
+    Args:
+        partner: Partner name
+        
+    Returns:
+        Serving state of the partner's model
+    """
+    azure_model_service.pin_model(partner)
+    return await run_download(azure_model_service.get_model_info, partner)
+
+
+@app.delete("/api/models/{partner}/pin")
+async def unpin_partner_model(partner: str):
+    """
+    Make a partner's model evictable again
+    
+    Args:
+        partner: Partner name
+        
+    Returns:
+        Serving state of the partner's model
+    """
+    azure_model_service.unpin_model(partner)
+    return await run_download(azure_model_service.get_model_info, partner)
+
+
+@app.get("/api/models/{partner}")
+async def get_partner_model_info(partner: str):
+    """
+    Serving state of a partner's model
+    
+    Args:
+        partner: Partner name
+        
+    Returns:
+        Version, load time, whether a reload is running and the last reload error
+    """
+    return await run_download(azure_model_service.get_model_info, partner)
 
 
 @app.post("/api/train")
-def train_model(sku: Optional[str] = None, region: Optional[str] = None):
+async def train_model(sku: Optional[str] = None, region: Optional[str] = None):
     """
-    Train/retrain local fallback LSTM model
+    Queue training of the local fallback LSTM model
     
     Args:
         sku: Optional SKU to train on
         region: Optional region to train on
         
     Returns:
-        Training status
+        Training status with the background job id
     """
     try:
         if sku and region:
-            training_data = data_service.get_training_data(sku, region)
-            lstm_model.train(training_data)
-            return {"status": "success", "message": f"Model trained on {sku}/{region}"}
+            training_data = await run_io(data_service.get_training_data, sku, region)
+            job = _schedule_fallback_training(sku, region, training_data)
+            return {
+                "status": job.status,
+                "job_id": job.job_id,
+                "message": f"Training queued for {sku}/{region}"
+            }
         else:
             return {"status": "success", "message": "Model training initiated"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/train/jobs")
+async def list_training_jobs():
+    """
+    List retained background training jobs
+    
+    Returns:
+        Job statuses, newest first
+    """
+    return {"jobs": training_service.list_jobs()}
+
+
+@app.get("/api/train/jobs/{job_id}")
+async def get_training_job(job_id: str):
+    """
+    Get the status of a background training job
+    
+    Args:
+        job_id: Job identifier returned by /api/train
+        
+    Returns:
+        Job status
+    """
+    job = training_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown training job: {job_id}")
+    return job.to_dict()
+
+
+@app.get("/api/train/jobs/{job_id}/result")
+async def get_training_job_result(job_id: str):
+    """
+    Get the result of a finished background training job
+    
+    Args:
+        job_id: Job identifier returned by /api/train
+        
+    Returns:
+        Job status plus the training result
+    """
+    job = training_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown training job: {job_id}")
+    if not job.done:
+        raise HTTPException(status_code=409, detail=f"Training job {job_id} is still {job.status}")
+    return {**job.to_dict(), "result": job.result}
+
+
 def run_server():
-    """Run the FastAPI server"""
-    uvicorn.run(app, host="0.0.0.0", port=config.API_PORT)
+    """Run the FastAPI server as a standalone process group (API_WORKERS worker processes)"""
+    uvicorn.run("backend:app", host=config.API_HOST, port=config.API_PORT, workers=config.API_WORKERS)
 
 
 if __name__ == "__main__":
@@ -6,9 +6,15 @@ from typing import Any, Dict, List, Optional
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
+import time
 from datetime import datetime
 import config
-from services.run_model import generate_price_prediction_statement
+from services.artifact_prefetch import prefetch_status
+from services.run_model import (
+    generate_price_prediction_statement,
+    generate_price_prediction_statements,
+    render_statement_html,
+)
 from services.data_service import DataService
 from services.sellout_kpis import get_sellout_kpis
 from utils.helpers import format_currency, format_currency_millions, format_number, format_percentage
@@ -530,12 +536,13 @@ def render_prediction_statement_card(result: Dict[str, Any]) -> None:
         """,
         unsafe_allow_html=True,
     )
-    st.markdown(result["table_html"], unsafe_allow_html=True)
+    st.markdown(render_statement_html(result), unsafe_allow_html=True)
 
 
 def render_prediction_dashboard(partner_options: Optional[List[str]] = None):
     """Render the prediction dashboard with the new statement view."""
     st.title("Prediction")
+    artifact_status = st.empty()
 
     partner_options = partner_options or config.get_training_partners() or config.DEFAULT_PARTNERS
     if not partner_options:
@@ -645,10 +652,119 @@ def render_prediction_dashboard(partner_options: Optional[List[str]] = None):
     result = st.session_state.prediction_results
     if st.session_state.get("prediction_ran") and result:
         render_prediction_statement_card(result)
+        render_partner_comparison(result["sku"], result["prediction_date"], partner_options)
     else:
         st.info("Select a SKU, a trading partner and a prediction date, then run the model.")
 
     render_model_evaluation()
+    render_artifact_progress(artifact_status)
+
+
+ARTIFACT_LABELS = {
+    "xgb_model": "Model",
+    "xgb_columns": "Encoded columns",
+    "xgb_source_data": "Source data",
+}
+
+
+def render_artifact_progress(placeholder, poll_seconds: float = 0.5) -> None:
+    """
+    Show the background artifact downloads in `placeholder`.
+
+    Draws one snapshot per run and schedules the next one instead of blocking the
+    script: a fragment with run_every refreshes just the progress bars (Streamlit
+    >= 1.37), otherwise the whole page is rerun after poll_seconds. Once the
+    downloads finish nothing is scheduled any more.
+    """
+    status = prefetch_status()
+    if status["finished"]:
+        with placeholder.container():
+            _draw_artifact_progress(status)
+        return
+
+    fragment = getattr(st, "fragment", None)
+    if fragment is not None:
+        with placeholder.container():
+            fragment(run_every=poll_seconds)(_artifact_progress_fragment)()
+        return
+
+    with placeholder.container():
+        _draw_artifact_progress(status)
+    time.sleep(poll_seconds)
+    st.rerun()
+
+
+def _artifact_progress_fragment() -> None:
+    """Fragment body: redraw the progress bars, rerun the page once everything is done."""
+    status = prefetch_status()
+    if status["finished"]:
+        # A full rerun draws the final state without a run_every timer
+        st.rerun()
+    _draw_artifact_progress(status)
+
+
+def _draw_artifact_progress(status: Dict[str, Any]) -> None:
+    """Draw one prefetch_status() snapshot in the current container."""
+    if status["finished"]:
+        failed = [
+            ARTIFACT_LABELS.get(name, name)
+            for name, item in status["artifacts"].items()
+            if item["state"] == "failed"
+        ]
+        if failed:
+            st.warning(
+                f"Could not preload: {', '.join(failed)}. It will be retried on the first prediction."
+            )
+        return
+
+    st.caption("Loading prediction model…")
+    for name, item in status["artifacts"].items():
+        label = ARTIFACT_LABELS.get(name, name)
+        received, total = item.get("bytes"), item.get("total_bytes")
+        if item["state"] in ("ready", "failed"):
+            st.progress(1.0, text=f"{label}: {item['state']}")
+        elif received is not None and total:
+            st.progress(
+                min(received / total, 1.0),
+                text=f"{label}: {received / 1e6:,.1f} / {total / 1e6:,.1f} MB",
+            )
+        elif received is not None:
+            st.progress(0.0, text=f"{label}: {received / 1e6:,.1f} MB")
+        else:
+            st.progress(0.0, text=f"{label}: {item['state']}")
+
+
+def render_partner_comparison(sku: str, prediction_date: str, partner_options: List[str]) -> None:
+    """Score one SKU for every trading partner with a single batch model call."""
+    with st.expander(f"Compare {sku} across trading partners"):
+        try:
+            comparison = generate_price_prediction_statements(
+                [(sku, partner, prediction_date) for partner in partner_options]
+            )
+        except Exception as exc:
+            st.error(f"Comparison failed: {exc}")
+            return
+
+        table_df = comparison["table_df"]
+        if table_df.empty:
+            st.info("No trading partner has history for this SKU.")
+        else:
+            st.dataframe(
+                table_df.drop(columns=["SKU", "CATEGORY"]).style.format(
+                    {
+                        "Past Price/Unit": "{:,.2f}",
+                        "Predicted Price/Unit": "{:,.2f}",
+                        "% Change": "{:,.2f}%",
+                        "INF": "{:,.6f}",
+                    },
+                    na_rep="—",
+                ),
+                use_container_width=True,
+                hide_index=True,
+            )
+        if comparison["missing"]:
+            missing = ", ".join(tp for _, tp in comparison["missing"])
+            st.caption(f"No history for: {missing}")
 
 
 def render_model_evaluation():
@@ -19,6 +19,36 @@ POSTGRES_CONNECTION_STRING = os.getenv(
 # API Configuration
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
 API_PORT = int(os.getenv("API_PORT", "8000"))
+API_HOST = os.getenv("API_HOST", "0.0.0.0")
+API_WORKERS = int(os.getenv("API_WORKERS", "1"))
+# "embedded": Streamlit starts the API in a thread; "standalone": the API runs as its own process group
+BACKEND_MODE = os.getenv("BACKEND_MODE", "embedded").lower()
+MAX_BATCH_PREDICTIONS = int(os.getenv("MAX_BATCH_PREDICTIONS", "1000"))
+HISTORY_MAX_PAGE_SIZE = int(os.getenv("HISTORY_MAX_PAGE_SIZE", "500"))
+MAX_SWEEP_SCENARIOS = int(os.getenv("MAX_SWEEP_SCENARIOS", "100000"))
+# Sweeps are scored in chunks whose float32 feature matrix stays under this size
+SWEEP_CHUNK_MB = int(os.getenv("SWEEP_CHUNK_MB", "16"))
+
+# Prediction Cache Configuration
+PREDICTION_CACHE_TTL_SECONDS = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "900"))
+PREDICTION_CACHE_MAX_ENTRIES = int(os.getenv("PREDICTION_CACHE_MAX_ENTRIES", "10000"))
+
+# Backend Startup Configuration
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+
+# Backend Executor Configuration
+IO_EXECUTOR_WORKERS = int(os.getenv("IO_EXECUTOR_WORKERS", "8"))  # DB queries, watermarks, local artifacts
+DOWNLOAD_EXECUTOR_WORKERS = int(os.getenv("DOWNLOAD_EXECUTOR_WORKERS", "4"))  # blob/model downloads
+CPU_EXECUTOR_WORKERS = int(os.getenv("CPU_EXECUTOR_WORKERS", str(os.cpu_count() or 2)))  # inference
+
+# Background Training Configuration
+TRAINING_WORKERS = int(os.getenv("TRAINING_WORKERS", "1"))
+TRAINING_JOB_HISTORY = int(os.getenv("TRAINING_JOB_HISTORY", "200"))
+
+# Fallback Model Registry Configuration
+FALLBACK_MODEL_DIR = os.getenv("FALLBACK_MODEL_DIR", "models/lstm")
+FALLBACK_MODEL_MEMORY_MB = int(os.getenv("FALLBACK_MODEL_MEMORY_MB", "512"))
+FALLBACK_MODEL_KEY = os.getenv("FALLBACK_MODEL_KEY", "series")  # "series" (sku+region) or "sku"
 
 # Azure Blob Storage Configuration
 AZURE_BLOB_BASE_URL = os.getenv(
@@ -30,6 +60,42 @@ AZURE_BLOB_SAS_TOKEN = os.getenv(
     "sp=r&st=2025-11-12T16:57:51Z&se=2026-09-17T01:12:51Z&sv=2024-11-04&sr=c&sig=YskSjKCiHsrn1CIJX9wQP8mH1oBVMNuUyAwjUR69M0Y%3D"
 )
 
+# Local on-disk model cache shared by all backend workers
+MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR", "models/cache")
+# In-memory budget for loaded partner models (LRU eviction above it) and partners never evicted
+PARTNER_MODEL_MEMORY_MB = int(os.getenv("PARTNER_MODEL_MEMORY_MB", "1024"))
+PINNED_PARTNERS = [p.strip() for p in os.getenv("PINNED_PARTNERS", "").split(",") if p.strip()]
+# Partner model downloads: timeouts (seconds) and resume attempts after a dropped transfer
+MODEL_DOWNLOAD_CONNECT_TIMEOUT = float(os.getenv("MODEL_DOWNLOAD_CONNECT_TIMEOUT", "10"))
+MODEL_DOWNLOAD_READ_TIMEOUT = float(os.getenv("MODEL_DOWNLOAD_READ_TIMEOUT", "60"))
+MODEL_DOWNLOAD_RETRIES = int(os.getenv("MODEL_DOWNLOAD_RETRIES", "3"))
+# How often a worker checks the shared disk copy for a model swapped in by another worker
+MODEL_REVALIDATE_SECONDS = float(os.getenv("MODEL_REVALIDATE_SECONDS", "30"))
+
+# Partner model store (see services/model_store.py): "azure" (blob container) or "local" (directory)
+MODEL_STORE_TYPE = os.getenv("MODEL_STORE_TYPE", "azure")
+LOCAL_MODEL_STORE_DIR = os.getenv("LOCAL_MODEL_STORE_DIR", "models/store")
+# Manifest listing partner, version, file, size and sha256 of every published model
+MODEL_MANIFEST_NAME = os.getenv("MODEL_MANIFEST_NAME", "manifest.json")
+MODEL_MANIFEST_TTL_SECONDS = float(os.getenv("MODEL_MANIFEST_TTL_SECONDS", "60"))
+# After a failed manifest read the last good copy is used and the read retried after this delay
+MODEL_MANIFEST_RETRY_SECONDS = float(os.getenv("MODEL_MANIFEST_RETRY_SECONDS", "30"))
+
+# Persistent disk cache for remote XGBoost artifacts (see services/artifact_cache.py)
+ARTIFACT_CACHE_DIR = os.getenv("ARTIFACT_CACHE_DIR", "models/artifacts")
+ARTIFACT_CACHE_MAX_MB = int(os.getenv("ARTIFACT_CACHE_MAX_MB", "4096"))
+
+# Precomputed XGBoost price table (see services/price_table.py)
+PRICE_TABLE_PATH = os.getenv("PRICE_TABLE_PATH", "models/price_table.pkl")
+PRICE_TABLE_WORKERS = int(os.getenv("PRICE_TABLE_WORKERS", str(os.cpu_count() or 2)))
+PRICE_TABLE_MAX_AGE_HOURS = float(os.getenv("PRICE_TABLE_MAX_AGE_HOURS", "36"))
+
+# Native XGBoost serving (see services/xgb_predictor.py)
+# URL of the final model exported in XGBoost's JSON/UBJ format; empty serves the pickled model
+XGB_NATIVE_MODEL_URL = os.getenv("XGB_NATIVE_MODEL_URL", "")
+# Threads per prediction call (0 = XGBoost default, all cores)
+XGB_PREDICT_THREADS = int(os.getenv("XGB_PREDICT_THREADS", "0"))
+
 # Default Values
 DEFAULT_PARTNERS = [
     "CHEDRAUI",
@@ -1,8 +1,9 @@
 """
 Abstract base class for data sources
 """
+import sys
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from datetime import datetime
 
 
@@ -66,6 +67,57 @@ class DataSource(ABC):
         """
         pass
     
+    def iter_price_history(
+        self,
+        sku: Optional[str] = None,
+        partner: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        before: Optional[Tuple[str, int]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterates price prediction history, newest first.
+        The default implementation filters get_price_history(); sources with
+        large histories should override it with an indexed scan.
+        
+        Args:
+            sku: Only records for this SKU
+            partner: Only records for this partner
+            start_date: Only records released on/after this date (YYYY-MM-DD)
+            end_date: Only records released on/before this date (YYYY-MM-DD)
+            before: Only records strictly older than this (release_date, id) position
+            
+        Returns:
+            Iterator of history dicts (keys: 'id', 'sku', 'region', 'partner', 'release_date', 'price')
+        """
+        records = sorted(
+            self.get_price_history(limit=sys.maxsize),
+            key=lambda record: (record["release_date"], record.get("id", 0)),
+            reverse=True,
+        )
+        for record in records:
+            if before is not None and (record["release_date"], record.get("id", 0)) >= before:
+                continue
+            if self.history_record_matches(record, sku, partner, start_date, end_date):
+                yield record
+    
+    @staticmethod
+    def history_record_matches(
+        record: Dict[str, Any],
+        sku: Optional[str] = None,
+        partner: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> bool:
+        """Whether a history record passes the sku/partner/date range filters"""
+        release_day = record["release_date"][:10]
+        return (
+            (sku is None or record["sku"] == sku)
+            and (partner is None or record["partner"] == partner)
+            and (start_date is None or release_day >= start_date)
+            and (end_date is None or release_day <= end_date)
+        )
+    
     @abstractmethod
     def get_training_data(self, sku: str, region: str) -> List[Dict[str, Any]]:
         """
@@ -80,6 +132,20 @@ class DataSource(ABC):
         """
         pass
     
+    def get_training_data_watermark(self, sku: str, region: str) -> Optional[str]:
+        """
+        Returns a marker that changes whenever the training data for a series changes
+        (e.g. the latest data timestamp). Used to version cached predictions.
+        
+        Args:
+            sku: SKU identifier
+            region: Region identifier
+            
+        Returns:
+            Watermark string, or None if the source cannot provide one
+        """
+        return None
+    
     @abstractmethod
     def get_brand_category_prices(self) -> Dict[str, Any]:
         """
@@ -2,9 +2,12 @@
 Mock data source implementation
 Code doesn't know this is mock - it's just another DataSource implementation
 """
+import bisect
+import itertools
 import random
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from .data_source import DataSource
 import sys
 import os
@@ -22,9 +25,23 @@ class MockDataSource(DataSource):
     
     def _initialize_mock_data(self):
         """Initialize mock data structures"""
+        # Kept sorted ascending by (release_date, id) so reads never re-sort
         self._price_history = []
+        self._history_ids = itertools.count(1)
+        self._history_lock = threading.Lock()
         self._generate_initial_history()
     
+    @staticmethod
+    def _history_position(record: Dict[str, Any]) -> Tuple[str, int]:
+        """Sort/cursor key of a history record"""
+        return (record["release_date"], record["id"])
+    
+    def _insert_history_record(self, record: Dict[str, Any]):
+        """Insert a record keeping the history sorted"""
+        with self._history_lock:
+            record["id"] = next(self._history_ids)
+            bisect.insort(self._price_history, record, key=self._history_position)
+    
     def _generate_initial_history(self):
         """Generate initial price history"""
         partners = config.DEFAULT_PARTNERS
@@ -32,7 +49,7 @@ class MockDataSource(DataSource):
         skus = config.DEFAULT_SKUS
         
         for _ in range(20):
-            self._price_history.append({
+            self._insert_history_record({
                 "sku": random.choice(skus),
                 "region": random.choice(regions),
                 "partner": random.choice(partners),
@@ -149,11 +166,40 @@ class MockDataSource(DataSource):
     
     def get_price_history(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Returns price prediction history"""
-        return sorted(self._price_history, key=lambda x: x["release_date"], reverse=True)[:limit]
+        return list(itertools.islice(self.iter_price_history(), limit))
+    
+    def iter_price_history(
+        self,
+        sku: Optional[str] = None,
+        partner: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        before: Optional[Tuple[str, int]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Walks the sorted history backwards from the cursor/end date, newest first"""
+        with self._history_lock:
+            position = len(self._price_history)
+            if end_date is not None:
+                # "~" sorts after any time suffix, so the bound covers the whole end day
+                position = bisect.bisect_left(
+                    self._price_history, (f"{end_date}~", 0), key=self._history_position
+                )
+            if before is not None:
+                position = min(
+                    position,
+                    bisect.bisect_left(self._price_history, tuple(before), key=self._history_position)
+                )
+        
+        for idx in range(position - 1, -1, -1):
+            record = self._price_history[idx]
+            if start_date is not None and record["release_date"][:10] < start_date:
+                break
+            if self.history_record_matches(record, sku, partner):
+                yield record
     
     def add_price_prediction(self, sku: str, region: str, partner: str, price: float):
         """Add a new price prediction to history"""
-        self._price_history.insert(0, {
+        self._insert_history_record({
             "sku": sku,
             "region": region,
             "partner": partner,
@@ -180,6 +226,10 @@ class MockDataSource(DataSource):
         
         return training_data
     
+    def get_training_data_watermark(self, sku: str, region: str) -> Optional[str]:
+        """Mock training data ends today, so it changes once per day"""
+        return datetime.now().date().isoformat()
+    
     def get_brand_category_prices(self) -> Dict[str, Any]:
         """Returns price data by brand and category"""
         brands = ["MABE", "WHIRLPOOL", "GE", "MAYTAG", "LG", "HISENSE", "TEKA", "MIDEA", "PANASONIC", "SAMSUNG"]
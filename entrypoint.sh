@@ -4,10 +4,39 @@ set -e
 # Honor Azure's PORT if provided; default to 8080
 PORT="${PORT:-8080}"
 
-exec streamlit run /app/app.py \
-  --server.address 0.0.0.0 \
-  --server.port "${PORT}" \
-  --server.headless true \
-  --browser.gatherUsageStats false
+# "embedded": Streamlit starts the API in a thread (default)
+# "standalone": the API runs as its own multi-worker uvicorn process group
+BACKEND_MODE="${BACKEND_MODE:-embedded}"
+export BACKEND_MODE
 
+start_streamlit() {
+  exec streamlit run /app/app.py \
+    --server.address 0.0.0.0 \
+    --server.port "${PORT}" \
+    --server.headless true \
+    --browser.gatherUsageStats false
+}
 
+if [ "${BACKEND_MODE}" != "standalone" ]; then
+  start_streamlit
+fi
+
+uvicorn backend:app \
+  --app-dir /app \
+  --host "${API_HOST:-127.0.0.1}" \
+  --port "${API_PORT:-8000}" \
+  --workers "${API_WORKERS:-2}" \
+  --log-level warning &
+BACKEND_PID=$!
+
+start_streamlit &
+STREAMLIT_PID=$!
+
+# Stop both process groups together
+trap 'kill "${BACKEND_PID}" "${STREAMLIT_PID}" 2>/dev/null' INT TERM
+set +e
+wait "${STREAMLIT_PID}"
+STATUS=$?
+kill "${BACKEND_PID}" 2>/dev/null
+wait "${BACKEND_PID}" 2>/dev/null
+exit "${STATUS}"
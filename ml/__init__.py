@@ -3,6 +3,7 @@ Machine learning models and utilities
 """
 from .lstm_model import LSTMModel
 from .data_processor import DataProcessor
+from .model_registry import ModelRegistry
 
-__all__ = ["LSTMModel", "DataProcessor"]
+__all__ = ["LSTMModel", "DataProcessor", "ModelRegistry"]
 
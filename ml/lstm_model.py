@@ -4,6 +4,9 @@ LSTM model for price prediction
 import numpy as np
 from typing import List, Dict, Any, Optional
 import os
+import pickle
+import threading
+from utils.file_lock import file_lock
 from .data_processor import DataProcessor
 
 # Try to import TensorFlow, fallback to simple prediction if not available
@@ -21,29 +24,73 @@ except ImportError:
 class LSTMModel:
     """LSTM model for price prediction"""
     
-    def __init__(self, sequence_length: int = 10):
+    DEFAULT_MODEL_PATH = "models/lstm_price_model.h5"
+    
+    def __init__(self, sequence_length: int = 10, model_path: Optional[str] = None, load_existing: bool = True):
         self.sequence_length = sequence_length
         self.model: Optional[keras.Model] = None
         self.processor = DataProcessor()
-        self.model_path = "models/lstm_price_model.h5"
-        self._load_or_create_model()
+        self.model_path = model_path or self.DEFAULT_MODEL_PATH
+        self.processor_path = f"{os.path.splitext(self.model_path)[0]}.processor.pkl"
+        self.is_trained = False
+        self._load_or_create_model(load_existing)
     
-    def _load_or_create_model(self):
-        """Load existing model or create new one"""
+    def _load_or_create_model(self, load_existing: bool = True):
+        """
+        Load the existing model. Without one the network is left unbuilt (model=None,
+        predictions use the trend fallback) until train() creates it.
+        """
         if not TENSORFLOW_AVAILABLE:
             self.model = None
             print("TensorFlow not available. Using simple prediction.")
             return
             
-        if os.path.exists(self.model_path):
+        if load_existing and os.path.exists(self.model_path):
             try:
-                self.model = keras.models.load_model(self.model_path)
+                # Shared with _save in every worker: weights and scaler are read as one pair
+                with file_lock(f"{self.model_path}.lock"):
+                    self.model = keras.models.load_model(self.model_path)
+                    self._load_processor()
+                self.is_trained = True
                 print(f"Loaded existing model from {self.model_path}")
             except Exception as e:
-                print(f"Error loading model: {e}. Creating new model.")
-                self._create_model()
-        else:
-            self._create_model()
+                self.model = None
+                print(f"Error loading model: {e}. Using simple prediction until trained.")
+    
+    def _load_processor(self):
+        """Restore the scaler/encoders saved alongside the model weights"""
+        if os.path.exists(self.processor_path):
+            with open(self.processor_path, "rb") as f:
+                self.processor = pickle.load(f)
+    
+    def _save(self):
+        """
+        Persist the weights and the scaler/encoders. Both are written to temp files
+        first and then swapped in together, so readers see either the old pair or the new one.
+        """
+        os.makedirs(os.path.dirname(self.model_path) or ".", exist_ok=True)
+        base, ext = os.path.splitext(self.model_path)
+        # Keras picks the format from the extension, so the temp file keeps it
+        tmp_model_path = f"{base}.{os.getpid()}.{threading.get_ident()}.tmp{ext}"
+        tmp_processor_path = f"{self.processor_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        self.model.save(tmp_model_path)
+        with open(tmp_processor_path, "wb") as f:
+            pickle.dump(self.processor, f)
+        with file_lock(f"{self.model_path}.lock"):
+            os.replace(tmp_model_path, self.model_path)
+            os.replace(tmp_processor_path, self.processor_path)
+    
+    def estimated_size_bytes(self) -> int:
+        """
+        Rough in-memory footprint of the model, used for registry memory budgets
+        
+        Returns:
+            Estimated size in bytes
+        """
+        if self.model is None:
+            return 1024
+        # float32 weights plus the two Adam moment slots
+        return int(self.model.count_params()) * 4 * 3
     
     def _create_model(self):
         """Create a new LSTM model architecture"""
@@ -97,10 +144,10 @@ class LSTMModel:
         
         # Train model
         self.model.fit(X, y, batch_size=32, epochs=10, verbose=0, validation_split=0.2)
+        self.is_trained = True
         
         # Save model
-        os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-        self.model.save(self.model_path)
+        self._save()
         print(f"Model trained and saved to {self.model_path}")
     
     def predict(self, sku: str, region: str, historical_prices: List[float]) -> float:
@@ -115,8 +162,8 @@ class LSTMModel:
         Returns:
             Predicted price
         """
-        # Fallback to simple prediction if TensorFlow not available
-        if not TENSORFLOW_AVAILABLE or self.model is None:
+        # Fallback to simple prediction if TensorFlow not available or the model was never fitted
+        if not TENSORFLOW_AVAILABLE or self.model is None or not self.is_trained:
             if not historical_prices:
                 return 500.0
             # Simple trend-based prediction
@@ -143,3 +190,47 @@ class LSTMModel:
         
         return float(prediction)
 
+
+    def predict_batch(
+        self,
+        skus: List[str],
+        regions: List[str],
+        histories: List[List[float]],
+    ) -> List[float]:
+        """
+        Predict prices for many SKU/region series with a single model call
+        
+        Args:
+            skus: SKU identifiers
+            regions: Region identifiers (aligned with skus)
+            histories: Historical prices for each series (aligned with skus)
+            
+        Returns:
+            Predicted prices in the same order as the inputs
+        """
+        predictions: List[Optional[float]] = [None] * len(skus)
+        batch_positions: List[int] = []
+        batch_inputs: List[np.ndarray] = []
+        
+        for idx, (sku, region, prices) in enumerate(zip(skus, regions, histories)):
+            # Series the LSTM cannot score go through the single-row fallback rules
+            if (
+                not TENSORFLOW_AVAILABLE
+                or self.model is None
+                or not self.is_trained
+                or len(prices) < self.sequence_length
+            ):
+                predictions[idx] = float(self.predict(sku, region, prices))
+                continue
+            batch_positions.append(idx)
+            batch_inputs.append(
+                self.processor.prepare_prediction_input(sku, region, prices, self.sequence_length)
+            )
+        
+        if batch_inputs:
+            X = np.concatenate(batch_inputs, axis=0)
+            scaled_predictions = self.model.predict(X, verbose=0)[:, 0]
+            for idx, scaled_prediction in zip(batch_positions, scaled_predictions):
+                predictions[idx] = float(self.processor.inverse_scale_price(scaled_prediction))
+        
+        return predictions
@@ -0,0 +1,165 @@
+"""
+Registry of per-series fallback LSTM models
+"""
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List
+from .lstm_model import LSTMModel
+
+
+def series_key(sku: str, region: str) -> Hashable:
+    """Default registry key: one model per SKU/region series"""
+    return (sku, region)
+
+
+def sku_key(sku: str, region: str) -> Hashable:
+    """Cluster all regions of a SKU onto one model"""
+    return (sku,)
+
+
+KEY_FUNCTIONS: Dict[str, Callable[[str, str], Hashable]] = {
+    "series": series_key,
+    "sku": sku_key,
+}
+
+
+class ModelRegistry:
+    """
+    LRU cache of LSTMModel instances keyed by series (or cluster of series).
+
+    Each key has its own artifact on disk, so training one series never
+    touches another series' weights or scaler. Models are loaded lazily on
+    first use and evicted least-recently-used when the estimated memory
+    budget is exceeded (evicted models stay on disk and are reloaded on demand).
+    """
+
+    def __init__(
+        self,
+        model_dir: str,
+        memory_budget_bytes: int,
+        key_fn: Callable[[str, str], Hashable] = series_key,
+        sequence_length: int = 10,
+    ):
+        self.model_dir = model_dir
+        self.memory_budget_bytes = memory_budget_bytes
+        self.key_fn = key_fn
+        self.sequence_length = sequence_length
+        self._models: "OrderedDict[Hashable, LSTMModel]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key_for(self, sku: str, region: str) -> Hashable:
+        """Registry key serving a SKU/region"""
+        return self.key_fn(sku, region)
+
+    def artifact_path(self, key: Hashable) -> str:
+        """
+        Per-key model path on disk
+
+        Args:
+            key: Registry key
+
+        Returns:
+            Path of the .h5 artifact for the key
+        """
+        parts = key if isinstance(key, tuple) else (key,)
+        raw = "__".join(str(part) for part in parts)
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", raw)[:80]
+        digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:8]
+        return os.path.join(self.model_dir, f"{slug}-{digest}.h5")
+
+    def get(self, sku: str, region: str) -> LSTMModel:
+        """
+        Get the model serving a SKU/region, loading it lazily from disk
+
+        Args:
+            sku: SKU identifier
+            region: Region identifier
+
+        Returns:
+            The series model (untrained models predict with the trend fallback
+            and are not kept, so a model trained later is picked up from disk)
+        """
+        key = self.key_for(sku, region)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return model
+            self.misses += 1
+
+        # Load outside the lock so other series are not blocked by disk I/O
+        model = LSTMModel(sequence_length=self.sequence_length, model_path=self.artifact_path(key))
+        with self._lock:
+            existing = self._models.get(key)
+            if existing is not None:
+                self._models.move_to_end(key)
+                return existing
+            if model.is_trained:
+                self._insert(key, model)
+        return model
+
+    def train(self, sku: str, region: str, training_data: List[Dict[str, Any]]) -> LSTMModel:
+        """
+        Train a fresh model for the series' key and swap it in when ready.
+        Requests keep using the previous model while training runs.
+
+        Args:
+            sku: SKU identifier
+            region: Region identifier
+            training_data: Training rows for the series
+
+        Returns:
+            The newly trained model
+        """
+        key = self.key_for(sku, region)
+        # Start from new weights rather than the saved artifact, which keeps serving until the swap
+        candidate = LSTMModel(
+            sequence_length=self.sequence_length, model_path=self.artifact_path(key), load_existing=False
+        )
+        candidate.train(training_data)
+        if candidate.is_trained:
+            with self._lock:
+                self._insert(key, candidate)
+        return candidate
+
+    def _insert(self, key: Hashable, model: LSTMModel):
+        """Insert/replace a model and evict LRU entries over budget (lock held)"""
+        self._models[key] = model
+        self._models.move_to_end(key)
+        self._sizes[key] = model.estimated_size_bytes()
+        while len(self._models) > 1 and sum(self._sizes.values()) > self.memory_budget_bytes:
+            evicted_key, _ = self._models.popitem(last=False)
+            del self._sizes[evicted_key]
+            self.evictions += 1
+
+    def evict(self, sku: str, region: str):
+        """Drop a series' model from memory (its artifact stays on disk)"""
+        key = self.key_for(sku, region)
+        with self._lock:
+            if self._models.pop(key, None) is not None:
+                del self._sizes[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Registry usage statistics
+
+        Returns:
+            Dict with loaded model count, memory estimate, budget and hit/miss/eviction counters
+        """
+        with self._lock:
+            return {
+                "models": len(self._models),
+                "estimated_bytes": sum(self._sizes.values()),
+                "budget_bytes": self.memory_budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -1,8 +1,9 @@
 """
 API client for communicating with the backend
 """
+import json
 import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional
 import config
 
 
@@ -42,6 +43,51 @@ class PriceCalculatorAPI:
             # Fallback to mock response if backend unavailable
             return self._mock_response(sku, region, time_range, partner)
     
+    def calculate_prices(self, items: List[Dict[str, str]], time_range: str) -> List[Dict[str, Any]]:
+        """
+        Calculate price predictions for many SKUs in a single request
+        
+        Args:
+            items: List of dicts with 'sku', 'region' and 'partner'
+            time_range: Time range for prediction
+            
+        Returns:
+            List of prediction results in the same order as items
+        """
+        try:
+            response = requests.post(
+                f"{self.base_url}/api/predict/batch",
+                json={"items": items, "time_range": time_range},
+                timeout=60
+            )
+            response.raise_for_status()
+            return response.json()["predictions"]
+        except requests.exceptions.RequestException as e:
+            # Fallback to mock responses if backend unavailable
+            return [
+                self._mock_response(item["sku"], item["region"], time_range, item.get("partner", "Walmart"))
+                for item in items
+            ]
+    
+    def sweep_prices(self, pairs: List[Dict[str, str]], grid: Dict[str, List[float]]) -> Dict[str, Any]:
+        """
+        Run a what-if sweep of the final model over GROSS_SALES / QTY / INV
+        
+        Args:
+            pairs: List of dicts with 'sku' and 'tp'
+            grid: Feature name -> values to try
+            
+        Returns:
+            Dict with 'scenarios' and the columnar result under 'columns'
+        """
+        response = requests.post(
+            f"{self.base_url}/api/predict/sweep",
+            json={"pairs": pairs, "grid": grid},
+            timeout=60
+        )
+        response.raise_for_status()
+        return response.json()
+    
     def get_history(self, limit: int = 10) -> list:
         """
         Get price prediction history
@@ -59,11 +105,34 @@ class PriceCalculatorAPI:
                 timeout=5
             )
             response.raise_for_status()
-            return response.json()
+            return response.json()["items"]
         except requests.exceptions.RequestException as e:
             # Fallback to empty list if backend unavailable
             return []
     
+    def iter_history(self, **filters: Optional[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the full prediction history as NDJSON, one record at a time
+        
+        Args:
+            **filters: Optional sku, partner, start_date, end_date filters
+            
+        Returns:
+            Iterator of history records (newest first)
+        """
+        params = {key: value for key, value in filters.items() if value is not None}
+        params["format"] = "ndjson"
+        with requests.get(
+            f"{self.base_url}/api/history",
+            params=params,
+            stream=True,
+            timeout=30
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+    
     def _mock_response(self, sku: str, region: str, time_range: str, partner: str) -> Dict[str, Any]:
         """Fallback mock response if backend is unavailable"""
         import random
@@ -0,0 +1,203 @@
+"""
+Persistent, content-addressed disk cache for remote artifacts (Azure blobs).
+
+Blobs are stored under their SHA-256 and indexed by URL without the query
+string, so rotating SAS tokens does not invalidate the cache. Cached entries
+are revalidated with ETag / Last-Modified conditional requests, written
+atomically, and evicted least-recently-used once the cache exceeds its size
+budget. Every process (Streamlit, backend workers) shares the same directory.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+
+from utils.file_lock import file_lock
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class ArtifactCache:
+    """Disk cache of remote files with HTTP revalidation and size-based eviction."""
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.blob_dir = os.path.join(cache_dir, "blobs")
+        self.index_path = os.path.join(cache_dir, "index.json")
+        # resource key -> (bytes received, total bytes or None) of in-flight downloads
+        self._progress: Dict[str, Tuple[int, Optional[int]]] = {}
+        self._progress_lock = threading.Lock()
+
+    @staticmethod
+    def resource_key(url: str) -> str:
+        """Cache key of a URL: the URL without its (SAS token) query string."""
+        return url.split("?", 1)[0]
+
+    def progress(self, url: str) -> Optional[Tuple[int, Optional[int]]]:
+        """
+        Progress of a download of `url` running in this process.
+
+        Returns:
+            (bytes received, total bytes or None if unknown), or None if not downloading
+        """
+        with self._progress_lock:
+            return self._progress.get(self.resource_key(url))
+
+    def _set_progress(self, key: str, progress: Optional[Tuple[int, Optional[int]]]) -> None:
+        with self._progress_lock:
+            if progress is None:
+                self._progress.pop(key, None)
+            else:
+                self._progress[key] = progress
+
+    def _lock_path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, "locks", f"{name}.lock")
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest)
+
+    @staticmethod
+    def blob_sha256(path: str) -> str:
+        """SHA-256 of a blob returned by fetch() (blobs are stored under their digest)."""
+        return os.path.basename(path)
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index: Dict[str, Dict[str, Any]]) -> None:
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _update_entry(self, key: str, entry: Optional[Dict[str, Any]]) -> None:
+        """Insert/replace (or drop, when entry is None) an index entry, then evict over budget."""
+        with file_lock(self._lock_path("index")):
+            index = self._read_index()
+            if entry is None:
+                index.pop(key, None)
+            else:
+                index[key] = entry
+            self._evict(index, keep=key)
+            self._write_index(index)
+
+    def _evict(self, index: Dict[str, Dict[str, Any]], keep: str) -> None:
+        """Drop least recently used entries until the cache fits its budget (index lock held)."""
+        total = sum(entry["size"] for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            entry = index.pop(key)
+            total -= entry["size"]
+            if not any(other["sha256"] == entry["sha256"] for other in index.values()):
+                try:
+                    os.remove(self._blob_path(entry["sha256"]))
+                except OSError:
+                    pass
+            logger.info("Evicted cached artifact %s (%d bytes)", key, entry["size"])
+
+    def _download(self, url: str, timeout: float, headers: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Stream a URL into the blob store.
+
+        Returns:
+            New index entry, or None if the server answered 304 Not Modified
+        """
+        with requests.get(url, headers=headers, stream=True, timeout=timeout) as response:
+            if response.status_code == 304:
+                return None
+            response.raise_for_status()
+
+            os.makedirs(self.blob_dir, exist_ok=True)
+            key = self.resource_key(url)
+            content_length = response.headers.get("Content-Length")
+            total = int(content_length) if content_length and content_length.isdigit() else None
+            tmp_path = os.path.join(self.blob_dir, f".download.{os.getpid()}.{time.monotonic_ns()}")
+            digest = hashlib.sha256()
+            size = 0
+            self._set_progress(key, (0, total))
+            try:
+                with open(tmp_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        if chunk:
+                            f.write(chunk)
+                            digest.update(chunk)
+                            size += len(chunk)
+                            self._set_progress(key, (size, total))
+                sha256 = digest.hexdigest()
+                os.replace(tmp_path, self._blob_path(sha256))
+            finally:
+                self._set_progress(key, None)
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+            return {
+                "sha256": sha256,
+                "size": size,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "last_access": time.time(),
+            }
+
+    def fetch(self, url: str, timeout: float = 60) -> str:
+        """
+        Return a local path holding the current content of `url`.
+
+        A cached copy is revalidated with a conditional request; if the remote is
+        unreachable the cached copy is served as-is.
+
+        Args:
+            url: Remote URL (query string may carry a SAS token)
+            timeout: Request timeout in seconds
+
+        Returns:
+            Path of the cached blob
+        """
+        key = self.resource_key(url)
+        key_hash = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+        # One process downloads a given artifact at a time; the others then revalidate
+        with file_lock(self._lock_path(key_hash)):
+            entry = self._read_index().get(key)
+            if entry is not None and not os.path.exists(self._blob_path(entry["sha256"])):
+                entry = None
+
+            headers: Dict[str, str] = {}
+            if entry is not None:
+                if entry.get("etag"):
+                    headers["If-None-Match"] = entry["etag"]
+                if entry.get("last_modified"):
+                    headers["If-Modified-Since"] = entry["last_modified"]
+
+            try:
+                new_entry = self._download(url, timeout, headers)
+            except requests.exceptions.RequestException as exc:
+                if entry is None:
+                    raise
+                logger.warning("Could not revalidate %s (%s); serving cached copy", key, exc)
+                new_entry = None
+
+            if new_entry is None:
+                if entry is None:
+                    raise RuntimeError(f"Unexpected 304 Not Modified for uncached artifact {key}")
+                entry = dict(entry, last_access=time.time())
+                logger.info("Artifact cache hit for %s", key)
+            else:
+                entry = new_entry
+                logger.info("Cached %s (%d bytes)", key, entry["size"])
+            self._update_entry(key, entry)
+            return self._blob_path(entry["sha256"])
@@ -0,0 +1,50 @@
+"""
+Background prefetch of the final XGBoost artifacts.
+
+start_prefetch() downloads the model, the encoded columns and the source data
+in parallel (once per process) so the first prediction does not wait on three
+serial downloads; prefetch_status() reports per-artifact state and progress.
+"""
+import threading
+from typing import Any, Dict
+
+from services.readiness import ReadinessTracker
+from services.run_model import FINAL_ARTIFACTS, artifact_download_progress, load_final_artifact
+
+_tracker = ReadinessTracker()
+_lock = threading.Lock()
+_started = False
+
+
+def start_prefetch() -> None:
+    """Start one background download per artifact (no-op if already started in this process)."""
+    global _started
+    with _lock:
+        if _started:
+            return
+        _started = True
+        for name in FINAL_ARTIFACTS:
+            _tracker.register(name)
+
+    for name in FINAL_ARTIFACTS:
+        threading.Thread(
+            target=_tracker.track,
+            args=(name, lambda name=name: load_final_artifact(name)),
+            name=f"prefetch-{name}",
+            daemon=True,
+        ).start()
+
+
+def prefetch_status() -> Dict[str, Any]:
+    """
+    Current prefetch report
+
+    Returns:
+        ReadinessTracker snapshot; each artifact also carries "bytes" and
+        "total_bytes" (None when not downloading or the size is unknown)
+    """
+    snapshot = _tracker.snapshot()
+    for name, item in snapshot["artifacts"].items():
+        progress = artifact_download_progress(name)
+        item["bytes"], item["total_bytes"] = progress if progress is not None else (None, None)
+    return snapshot
@@ -1,33 +1,135 @@
 """
-Azure Blob Storage service for loading ML models
+Service for loading partner ML models from the model store (Azure Blob Storage by default)
 """
-import requests
+import hashlib
+import json
+import logging
+import os
 import pickle
-from io import BytesIO
-from typing import Dict, Any, Optional
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional, Set, Tuple
 import config
+from services.executors import io_executor
+from services.model_cache import ModelMemoryCache
+from services.model_store import CHUNK_SIZE, ManifestEntry, create_model_store
+from utils.file_lock import file_lock
+from utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class ModelHandle:
+    """An immutable loaded model version; requests keep the handle they started with"""
+    
+    def __init__(
+        self, partner: str, model: Any, version: str, size_bytes: int, source: Optional[Tuple] = None
+    ):
+        self.partner = partner
+        self.model = model
+        self.version = version
+        self.size_bytes = size_bytes
+        # (inode, mtime_ns, size) of the disk copy the model was read from
+        self.source = source
+        self.loaded_at = datetime.now().isoformat()
+
+
+def _file_signature(stat: os.stat_result) -> Tuple:
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
 
 
 class AzureModelService:
     """Service for loading ML models from Azure Blob Storage"""
     
     def __init__(self):
-        self.loaded_models: Dict[str, Any] = {}
-        self.base_url = config.AZURE_BLOB_BASE_URL
-        self.sas_token = config.AZURE_BLOB_SAS_TOKEN
+        # partner -> ModelHandle, LRU-evicted by estimated size
+        self.loaded_models = ModelMemoryCache(
+            budget_bytes=config.PARTNER_MODEL_MEMORY_MB * 1024 * 1024,
+            pinned=config.PINNED_PARTNERS,
+        )
+        self.store = create_model_store()
+        self.cache_dir = config.MODEL_CACHE_DIR
+        self._load_flight = SingleFlight()
+        self._swap_lock = threading.Lock()
+        self._reloading: Set[str] = set()
+        self._reload_errors: Dict[str, str] = {}
+        # partner -> monotonic time its handle was last checked against the disk copy
+        self._checked_at: Dict[str, float] = {}
     
-    def get_model_url(self, partner: str) -> str:
+    def get_model_cache_path(self, partner: str) -> str:
         """
-        Get the Azure Blob URL for a partner's model
+        Local disk path of a partner's cached model, shared by all backend workers
         
         Args:
             partner: Training partner name
             
         Returns:
-            Full URL with SAS token
+            Path of the cached pickle
         """
         model_filename = f"{partner.lower().replace(' ', '_')}_model.pkl"
-        return f"{self.base_url}/{model_filename}?{self.sas_token}"
+        return os.path.join(self.cache_dir, model_filename)
+    
+    def get_model_version(self, partner: str) -> Optional[str]:
+        """
+        Get the version of the model currently serving a partner
+        
+        Args:
+            partner: Training partner name
+            
+        Returns:
+            Content hash of the loaded model, or None if not loaded yet
+        """
+        handle = self.loaded_models.peek(partner)
+        return handle.version if handle is not None else None
+    
+    def get_handle(self, partner: str) -> ModelHandle:
+        """
+        Get the handle currently serving a partner, loading it on first use.
+        Concurrent callers for the same partner share a single download.
+        
+        Args:
+            partner: Training partner name
+            
+        Returns:
+            Model handle (model plus version)
+        """
+        handle = self.cached_handle(partner)
+        if handle is not None:
+            return handle
+        
+        return self.load_handle(partner)
+    
+    def cached_handle(self, partner: str) -> Optional[ModelHandle]:
+        """
+        Get the handle serving a partner if it is already in memory (never blocks on I/O).
+        At most every config.MODEL_REVALIDATE_SECONDS this also schedules a check of the
+        shared disk copy in the I/O pool, so a swap made by another worker's reload is
+        picked up without a download; requests keep the current handle meanwhile.
+        
+        Args:
+            partner: Training partner name
+            
+        Returns:
+            Model handle, or None if the model is not loaded
+        """
+        handle = self.loaded_models.get(partner)
+        if handle is not None and self._claim_revalidation(partner):
+            io_executor.submit(self._revalidate_quietly, handle)
+        return handle
+    
+    def load_handle(self, partner: str) -> ModelHandle:
+        """
+        Load a partner's model into memory (after a cached_handle miss).
+        Concurrent callers for the same partner share a single download.
+        
+        Args:
+            partner: Training partner name
+            
+        Returns:
+            Model handle (model plus version)
+        """
+        return self._load_flight.do(partner, self._load_handle, partner)
     
     def load_model(self, partner: str) -> Any:
         """
@@ -39,49 +141,239 @@ class AzureModelService:
         Returns:
             Loaded model object
         """
-        # Check if already loaded
-        if partner in self.loaded_models:
-            return self.loaded_models[partner]
-        
-        # Download and load model
-        url = self.get_model_url(partner)
-        
-        response = requests.get(url)
-        response.raise_for_status()
+        return self.get_handle(partner).model
+    
+    def _load_handle(self, partner: str) -> ModelHandle:
+        """Load a partner model from the disk cache, downloading it if missing (once per in-flight load)"""
+        # Another load may have finished between the cache check and taking the flight
+        handle = self.loaded_models.peek(partner)
+        if handle is not None:
+            return handle
         
-        model = pickle.load(BytesIO(response.content))
+        handle = self._read_handle(partner, *self._fetch_model(partner, refresh=False))
+        with self._swap_lock:
+            self._checked_at[partner] = time.monotonic()
+            # A concurrent reload may already have installed a newer version
+            return self.loaded_models.put(partner, handle, handle.size_bytes, replace=False)
+    
+    def _claim_revalidation(self, partner: str) -> bool:
+        """Whether the caller should check the disk copy now (one check per interval)"""
+        with self._swap_lock:
+            now = time.monotonic()
+            if now - self._checked_at.get(partner, 0.0) < config.MODEL_REVALIDATE_SECONDS:
+                return False
+            self._checked_at[partner] = now
+            return True
+    
+    def _revalidate_quietly(self, handle: ModelHandle):
+        """Background revalidation: failures are logged and the current handle keeps serving"""
+        try:
+            self._revalidate(handle)
+        except Exception as e:
+            logger.warning("Could not revalidate the model for %s: %s", handle.partner, e)
+    
+    def _revalidate(self, handle: ModelHandle) -> ModelHandle:
+        """Swap in the disk copy if another worker replaced it since this handle was read"""
+        partner = handle.partner
+        cache_path = self.get_model_cache_path(partner)
+        try:
+            if _file_signature(os.stat(cache_path)) == handle.source:
+                return handle
+            # The lock keeps the file and its sidecar from changing while they are read
+            with file_lock(f"{cache_path}.lock"):
+                new_handle = self._read_handle(partner, cache_path, self._disk_entry(partner))
+        except OSError as e:
+            logger.warning("Could not revalidate the model for %s: %s", partner, e)
+            return handle
         
-        # Cache the loaded model
-        self.loaded_models[partner] = model
+        with self._swap_lock:
+            current = self.loaded_models.peek(partner)
+            if current is not None and current is not handle:
+                # A reload in this worker got there first
+                return current
+            self.loaded_models.put(partner, new_handle, new_handle.size_bytes)
+        logger.info("Picked up model for %s from disk: %s -> %s", partner, handle.version, new_handle.version)
+        return new_handle
+    
+    def _disk_entry(self, partner: str) -> ManifestEntry:
+        """Manifest entry recorded next to the disk copy when it was fetched"""
+        try:
+            with open(f"{self.get_model_cache_path(partner)}.json", "r", encoding="utf-8") as f:
+                return ManifestEntry(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return ManifestEntry.default_for(partner)
+    
+    def _fetch_model(
+        self, partner: str, refresh: bool, entry: Optional[ManifestEntry] = None
+    ) -> Tuple[str, ManifestEntry]:
+        """
+        Make sure the partner model on disk matches the store's manifest
         
-        return model
+        Args:
+            partner: Training partner name
+            refresh: Re-read the manifest, and download even if an unversioned cached copy exists
+            entry: Manifest entry already read by the caller
+            
+        Returns:
+            Path of the cached pickle and its manifest entry
+        """
+        entry = entry or self.store.entry_for(partner, refresh=refresh)
+        cache_path = self.get_model_cache_path(partner)
+        # One worker downloads while the others wait, then everyone reads the disk copy
+        with file_lock(f"{cache_path}.lock"):
+            if entry.version is None and entry.sha256 is None and not refresh and os.path.exists(cache_path):
+                # Unlisted, or the manifest is unreachable: keep the version recorded with the disk copy
+                entry = self._disk_entry(partner)
+            if not self._is_current(cache_path, entry, refresh):
+                # Handles already in memory are unaffected by replacing the file
+                self.store.fetch(entry, cache_path)
+                tmp_path = f"{cache_path}.json.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(entry.to_dict(), f)
+                os.replace(tmp_path, f"{cache_path}.json")
+        return cache_path, entry
+    
+    def _is_current(self, cache_path: str, entry: ManifestEntry, refresh: bool) -> bool:
+        """Whether the disk copy can be used as is (revalidated against the manifest, no download)"""
+        if not os.path.exists(cache_path):
+            return False
+        if entry.version is None and entry.sha256 is None:
+            # Nothing to compare against: trust the disk copy unless a refresh was asked for
+            return not refresh
+        try:
+            with open(f"{cache_path}.json", "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if entry.sha256 is not None:
+            return cached.get("sha256") == entry.sha256
+        return cached.get("version") == entry.version
+    
+    def _read_handle(self, partner: str, path: str, entry: ManifestEntry) -> ModelHandle:
+        """Unpickle a cached model into a handle versioned by the manifest (or its content hash)"""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            source = _file_signature(os.fstat(f.fileno()))
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+            # Unpickle straight from the file instead of holding the raw bytes as well
+            f.seek(0)
+            model = pickle.load(f)
+        version = entry.version or digest.hexdigest()[:12]
+        # Models that know their footprint report it; otherwise the pickle size approximates it
+        estimate = getattr(model, "estimated_size_bytes", None)
+        size_bytes = int(estimate()) if callable(estimate) else os.path.getsize(path)
+        return ModelHandle(partner, model, version, size_bytes, source=source)
     
     def list_available_partners(self) -> list:
         """
-        Get list of available training partners
-        For now returns configured partners
-        Could be enhanced to query Azure Blob Storage
+        Get list of training partners with a published model, from the store's manifest.
+        Stores without a manifest fall back to the partners found in the sales data.
         
         Returns:
             List of partner names
         """
-        return config.get_training_partners()
+        return self.store.list_partners() or config.get_training_partners()
     
     def clear_cache(self):
         """Clear cached models to free memory"""
         self.loaded_models.clear()
     
-    def reload_model(self, partner: str) -> Any:
+    def reload_model(self, partner: str) -> ModelHandle:
         """
-        Force reload a model from Azure
+        Download and load a partner's latest model, then swap it in atomically.
+        The current handle keeps serving until the swap, and requests that
+        already hold it finish on it. Nothing is downloaded when the manifest
+        lists the version already serving.
         
         Args:
             partner: Training partner name
             
         Returns:
-            Reloaded model object
+            The handle now serving the partner
         """
-        if partner in self.loaded_models:
-            del self.loaded_models[partner]
-        return self.load_model(partner)
-
+        return self._load_flight.do(("reload", partner), self._reload_handle, partner)
+    
+    def _reload_handle(self, partner: str) -> ModelHandle:
+        current = self.loaded_models.peek(partner)
+        entry = self.store.entry_for(partner, refresh=True)
+        if current is not None and entry.version is not None and current.version == entry.version:
+            # Already serving the published version: nothing to download
+            return current
+        
+        with self._swap_lock:
+            self._reloading.add(partner)
+        try:
+            handle = self._read_handle(partner, *self._fetch_model(partner, refresh=True, entry=entry))
+        except Exception as e:
+            with self._swap_lock:
+                self._reload_errors[partner] = str(e)
+            raise
+        finally:
+            with self._swap_lock:
+                self._reloading.discard(partner)
+        
+        with self._swap_lock:
+            previous = self.loaded_models.peek(partner)
+            self.loaded_models.put(partner, handle, handle.size_bytes)
+            self._checked_at[partner] = time.monotonic()
+            self._reload_errors.pop(partner, None)
+        logger.info(
+            "Swapped model for %s: %s -> %s",
+            partner,
+            previous.version if previous is not None else None,
+            handle.version,
+        )
+        return handle
+    
+    def get_model_info(self, partner: str) -> Dict[str, Any]:
+        """
+        Serving state of a partner's model (may read the store's manifest)
+        
+        Args:
+            partner: Training partner name
+            
+        Returns:
+            Dict with version, latest_version (from the manifest), loaded_at,
+            reloading and last_reload_error
+        """
+        latest_version = self.store.entry_for(partner).version
+        with self._swap_lock:
+            handle = self.loaded_models.peek(partner)
+            return {
+                "partner": partner,
+                "version": handle.version if handle is not None else None,
+                "latest_version": latest_version,
+                "loaded_at": handle.loaded_at if handle is not None else None,
+                "estimated_bytes": handle.size_bytes if handle is not None else None,
+                "pinned": self.loaded_models.is_pinned(partner),
+                "reloading": partner in self._reloading,
+                "last_reload_error": self._reload_errors.get(partner),
+            }
+    
+    def pin_model(self, partner: str):
+        """
+        Keep a partner's model in memory regardless of the memory budget
+        
+        Args:
+            partner: Training partner name
+        """
+        self.loaded_models.pin(partner)
+    
+    def unpin_model(self, partner: str):
+        """
+        Make a partner's model evictable again
+        
+        Args:
+            partner: Training partner name
+        """
+        self.loaded_models.unpin(partner)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Loaded model cache statistics
+        
+        Returns:
+            Entry count, size estimate vs budget, pinned partners and hit/miss/eviction counters
+        """
+        return self.loaded_models.stats()
@@ -66,10 +66,18 @@ class DataService:
         """Get price prediction history"""
         return self._data_source.get_price_history(limit)
     
+    def iter_price_history(self, **filters):
+        """Lazily iterate price prediction history (newest first) with optional filters"""
+        return self._data_source.iter_price_history(**filters)
+    
     def get_training_data(self, sku: str, region: str):
         """Get training data for LSTM"""
         return self._data_source.get_training_data(sku, region)
     
+    def get_training_data_watermark(self, sku: str, region: str):
+        """Get the training data version marker for a SKU/region"""
+        return self._data_source.get_training_data_watermark(sku, region)
+    
     def get_brand_category_prices(self):
         """Get price data by brand and category"""
         return self._data_source.get_brand_category_prices()
@@ -8,6 +8,7 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 
 import config
+from services.metrics import DB_QUERY_SECONDS
 
 _engine: Optional[Engine] = None
 
@@ -23,6 +24,13 @@ def get_engine() -> Engine:
     return _engine
 
 
+def ping() -> None:
+    """Open a pooled connection and run a trivial query (warms the pool)."""
+    engine = get_engine()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
 def run_query(query: str, params: Optional[Mapping[str, Any]] = None) -> pd.DataFrame:
     """
     Execute a SQL query and return the results as a DataFrame.
@@ -31,7 +39,8 @@ def run_query(query: str, params: Optional[Mapping[str, Any]] = None) -> pd.Data
         query: Raw SQL string to execute.
         params: Optional mapping of parameters.
     """
-    engine = get_engine()
-    with engine.connect() as conn:
-        return pd.read_sql(text(query), conn, params=params)
+    with DB_QUERY_SECONDS.time():
+        engine = get_engine()
+        with engine.connect() as conn:
+            return pd.read_sql(text(query), conn, params=params)
 
@@ -0,0 +1,49 @@
+"""
+Bounded executors for offloading blocking work from async endpoints
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+import config
+
+T = TypeVar("T")
+
+# Blocking I/O: DB/pandas queries, model artifacts on disk
+io_executor = ThreadPoolExecutor(max_workers=config.IO_EXECUTOR_WORKERS, thread_name_prefix="io")
+
+# Blob/model downloads, kept apart so slow transfers never queue ahead of per-request queries
+download_executor = ThreadPoolExecutor(
+    max_workers=config.DOWNLOAD_EXECUTOR_WORKERS, thread_name_prefix="download"
+)
+
+# CPU-bound work: model inference
+cpu_executor = ThreadPoolExecutor(max_workers=config.CPU_EXECUTOR_WORKERS, thread_name_prefix="cpu")
+
+
+async def _run_in(executor: ThreadPoolExecutor, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable in the given executor and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+
+async def run_io(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run blocking I/O in the I/O pool"""
+    return await _run_in(io_executor, fn, *args, **kwargs)
+
+
+async def run_download(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blob/model download (or anything that may trigger one) in the download pool"""
+    return await _run_in(download_executor, fn, *args, **kwargs)
+
+
+async def run_cpu(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run CPU-bound work (inference) in the CPU pool"""
+    return await _run_in(cpu_executor, fn, *args, **kwargs)
+
+
+def shutdown_executors(wait: bool = False):
+    """Stop all pools (used on application shutdown)"""
+    io_executor.shutdown(wait=wait, cancel_futures=True)
+    download_executor.shutdown(wait=wait, cancel_futures=True)
+    cpu_executor.shutdown(wait=wait, cancel_futures=True)
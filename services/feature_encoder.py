@@ -0,0 +1,185 @@
+"""
+Precompiled one-hot encoder for the final XGBoost model.
+
+Compiles the model's ``encoded_columns`` list once into a name -> position map
+and writes numeric and one-hot features straight into a float32 buffer, giving
+the same feature matrix as ``pd.get_dummies(...).reindex(columns=encoded_columns,
+fill_value=0)`` without building intermediate frames.
+
+Check that it still matches that reference path with:
+
+    python -m services.feature_encoder --verify
+"""
+import argparse
+import sys
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+NUMERIC_FEATURES: Tuple[str, ...] = ("INV", "QTY", "GROSS_SALES")
+CATEGORICAL_FEATURES: Tuple[str, ...] = ("SKU", "TP", "CATEGORY")
+
+
+class FeatureEncoder:
+    """Encodes base rows (INV, QTY, GROSS_SALES, SKU, TP, CATEGORY) into model features."""
+
+    def __init__(
+        self,
+        feature_cols: Sequence[str],
+        numeric: Sequence[str] = NUMERIC_FEATURES,
+        categorical: Sequence[str] = CATEGORICAL_FEATURES,
+    ):
+        self.feature_names = [str(name) for name in feature_cols]
+        self.n_features = len(self.feature_names)
+        positions = {name: position for position, name in enumerate(self.feature_names)}
+
+        # Numeric features the model does not use are dropped, as reindex would
+        self.numeric_positions: Dict[str, int] = {
+            name: positions[name] for name in numeric if name in positions
+        }
+        # get_dummies names one-hot columns "<feature>_<value>"
+        self.onehot_positions: Dict[str, Dict[str, int]] = {}
+        for feature in categorical:
+            prefix = f"{feature}_"
+            self.onehot_positions[feature] = {
+                name[len(prefix):]: position
+                for name, position in positions.items()
+                if name.startswith(prefix) and name not in self.numeric_positions
+            }
+        self._local = threading.local()
+
+    def _position(self, feature: str, value: Any) -> Optional[int]:
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
+            return None
+        return self.onehot_positions[feature].get(str(value))
+
+    def encode(self, row: Mapping[str, Any]) -> np.ndarray:
+        """
+        Encode one row into this thread's reusable (1, n_features) buffer.
+        The buffer is overwritten by the next call on the same thread.
+
+        Args:
+            row: Mapping with the numeric and categorical base features
+
+        Returns:
+            float32 feature matrix with a single row
+        """
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = np.zeros((1, self.n_features), dtype=np.float32)
+            self._local.buffer = buffer
+        else:
+            buffer.fill(0.0)
+
+        for feature, position in self.numeric_positions.items():
+            buffer[0, position] = row[feature]
+        for feature in self.onehot_positions:
+            position = self._position(feature, row[feature])
+            if position is not None:
+                buffer[0, position] = 1.0
+        return buffer
+
+    def encode_batch(self, rows: Mapping[str, Any]) -> np.ndarray:
+        """
+        Encode many rows at once.
+
+        Args:
+            rows: DataFrame (or mapping of equal-length columns) with the base features
+
+        Returns:
+            New float32 feature matrix of shape (n_rows, n_features)
+        """
+        n_rows = len(rows[next(iter(self.onehot_positions))])
+        matrix = np.zeros((n_rows, self.n_features), dtype=np.float32)
+        row_ids = np.arange(n_rows)
+
+        for feature, position in self.numeric_positions.items():
+            matrix[:, position] = np.asarray(rows[feature], dtype=np.float32)
+        for feature in self.onehot_positions:
+            lookup = [self._position(feature, value) for value in rows[feature]]
+            positions = np.array([-1 if p is None else p for p in lookup], dtype=np.int64)
+            found = positions >= 0
+            matrix[row_ids[found], positions[found]] = 1.0
+        return matrix
+
+
+@lru_cache(maxsize=8)
+def _compile(feature_cols: Tuple[str, ...]) -> FeatureEncoder:
+    return FeatureEncoder(feature_cols)
+
+
+def get_feature_encoder(feature_cols: Sequence[str]) -> FeatureEncoder:
+    """Compiled encoder for an encoded-columns list (compiled once per distinct list)."""
+    return _compile(tuple(feature_cols))
+
+
+def reference_encode(rows: pd.DataFrame, feature_cols: Sequence[str]) -> np.ndarray:
+    """The pandas path the encoder replaces: get_dummies + reindex to the model layout."""
+    encoded = pd.get_dummies(rows, columns=list(CATEGORICAL_FEATURES)).reindex(
+        columns=list(feature_cols), fill_value=0
+    )
+    return encoded.to_numpy(dtype=np.float32)
+
+
+def verify() -> float:
+    """
+    Compare encode/encode_batch with reference_encode on a small frame covering
+    missing values, unseen categories, non-string categories and model columns
+    the encoder never fills.
+
+    Returns:
+        Largest absolute difference found
+
+    Raises:
+        AssertionError: If any row differs
+    """
+    feature_cols = [
+        "GROSS_SALES", "SKU_A1", "SKU_B2", "SKU_300", "QTY", "TP_WALMART", "TP_SEARS",
+        "CATEGORY_WASHER", "CATEGORY_DRYER", "INV", "UNUSED_FEATURE",
+    ]
+    rows = pd.DataFrame(
+        {
+            "INV": [1, 3, 0, 7, 2],
+            "QTY": [1, 2, 5, 1, 4],
+            "GROSS_SALES": [1500.25, 0.0, 99.5, 12345.0, 7.75],
+            "SKU": ["A1", "B2", None, "UNSEEN", 300],
+            "TP": ["WALMART", "SEARS", "WALMART", np.nan, "NEW_PARTNER"],
+            "CATEGORY": ["WASHER", np.nan, "DRYER", "WASHER", "FRIDGE"],
+        }
+    )
+    expected = reference_encode(rows, feature_cols)
+    encoder = FeatureEncoder(feature_cols)
+
+    batch = encoder.encode_batch(rows)
+    single = np.vstack([encoder.encode(row).copy() for row in rows.to_dict("records")])
+    max_diff = 0.0
+    for name, actual in (("encode_batch", batch), ("encode", single)):
+        diff = float(np.max(np.abs(actual - expected)))
+        assert actual.shape == expected.shape and diff == 0.0, (
+            f"{name} differs from get_dummies + reindex (max abs diff {diff})"
+        )
+        max_diff = max(max_diff, diff)
+    return max_diff
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Precompiled feature encoder for the final XGBoost model.")
+    parser.add_argument("--verify", action="store_true", help="Check the encoder against get_dummies + reindex")
+    args = parser.parse_args(argv)
+
+    if not args.verify:
+        parser.print_help()
+        return
+    try:
+        max_diff = verify()
+    except AssertionError as exc:
+        print(f"FAILED: {exc}")
+        sys.exit(1)
+    print(f"OK: encode and encode_batch match get_dummies + reindex (max abs diff {max_diff})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Memory-bounded LRU cache of loaded partner models
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+
+
+class ModelMemoryCache:
+    """
+    Thread-safe LRU cache bounded by the estimated size of its entries.
+
+    Least recently used entries are evicted once the total estimate exceeds
+    the budget; pinned keys are never evicted (they still count toward the
+    budget). Evicted models are simply reloaded from the disk cache on demand.
+    """
+
+    def __init__(self, budget_bytes: int, pinned: Iterable[Hashable] = ()):
+        self.budget_bytes = budget_bytes
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._pinned: Set[Hashable] = set(pinned)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get an entry and mark it most recently used
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Get an entry without touching recency or counters"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: Hashable, value: Any, size_bytes: int, replace: bool = True) -> Any:
+        """
+        Insert an entry and evict LRU entries over budget
+
+        Args:
+            key: Cache key
+            value: Value to store
+            size_bytes: Estimated memory footprint of the value
+            replace: Replace an existing entry (otherwise keep and return it)
+
+        Returns:
+            The value now cached under key
+        """
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None and not replace:
+                self._entries.move_to_end(key)
+                return existing
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._sizes[key] = size_bytes
+            self._evict(keep=key)
+            return value
+
+    def _evict(self, keep: Hashable):
+        """Drop unpinned LRU entries until the cache fits its budget (lock held)"""
+        total = sum(self._sizes.values())
+        for key in list(self._entries):
+            if total <= self.budget_bytes:
+                break
+            if key == keep or key in self._pinned:
+                continue
+            del self._entries[key]
+            total -= self._sizes.pop(key)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove an entry"""
+        with self._lock:
+            self._sizes.pop(key, None)
+            return self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove every entry (pins are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+
+    def pin(self, key: Hashable):
+        """Never evict a key (it may be pinned before it is loaded)"""
+        with self._lock:
+            self._pinned.add(key)
+
+    def unpin(self, key: Hashable):
+        """Make a key evictable again"""
+        with self._lock:
+            self._pinned.discard(key)
+            self._evict(keep=None)
+
+    def is_pinned(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._pinned
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache usage statistics
+
+        Returns:
+            Dict with entry count, size estimate, budget, pinned keys, hit/miss/eviction
+            counters and per-entry sizes (least recently used first)
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "estimated_bytes": sum(self._sizes.values()),
+                "budget_bytes": self.budget_bytes,
+                "pinned": sorted(str(key) for key in self._pinned),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "sizes": {str(key): self._sizes[key] for key in self._entries},
+            }
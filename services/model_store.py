@@ -0,0 +1,401 @@
+"""
+Pluggable store of partner models, described by a manifest.
+
+The manifest (``manifest.json`` at the store root) lists every published model:
+
+    {"models": [{"partner": "Walmart", "version": "2025-12-01", "file": "walmart_model.pkl",
+                 "size": 123456, "sha256": "..."}]}
+
+Partner discovery, version checks and cache revalidation all read this one
+small file instead of probing blobs per partner. Models missing from the
+manifest (or stores without one) fall back to the ``<partner>_model.pkl``
+naming convention, without version or hash. When the manifest cannot be read
+the last good copy keeps being used (or, before the first read, the naming
+convention, so cached models still load from disk).
+"""
+import base64
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+# Transfer failures worth resuming; HTTP error statuses are raised immediately
+RESUMABLE_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class ManifestEntry:
+    """One published partner model"""
+
+    def __init__(
+        self,
+        partner: str,
+        file: str,
+        version: Optional[str] = None,
+        size: Optional[int] = None,
+        sha256: Optional[str] = None,
+    ):
+        self.partner = partner
+        self.file = file
+        self.version = version
+        self.size = size
+        self.sha256 = sha256
+
+    @classmethod
+    def default_for(cls, partner: str) -> "ManifestEntry":
+        """Entry following the naming convention, for partners missing from the manifest"""
+        return cls(partner, f"{partner.lower().replace(' ', '_')}_model.pkl")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "partner": self.partner,
+            "file": self.file,
+            "version": self.version,
+            "size": self.size,
+            "sha256": self.sha256,
+        }
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def verify_file(path: str, entry: ManifestEntry):
+    """
+    Check a local copy against its manifest entry (size and hash, when listed)
+
+    Args:
+        path: Local file
+        entry: Manifest entry
+
+    Raises:
+        IOError: If the size or hash does not match
+    """
+    size = os.path.getsize(path)
+    if entry.size is not None and size != entry.size:
+        raise IOError(f"Model for {entry.partner} has {size} bytes, manifest lists {entry.size}")
+    if entry.sha256 and _file_sha256(path) != entry.sha256:
+        raise IOError(f"Model for {entry.partner} does not match the manifest sha256")
+
+
+class ModelStore(ABC):
+    """Abstract model store. Implementations provide the raw manifest and file transfer."""
+
+    def __init__(self, manifest_ttl_seconds: Optional[float] = None, retry_seconds: Optional[float] = None):
+        self.manifest_ttl_seconds = (
+            manifest_ttl_seconds if manifest_ttl_seconds is not None else config.MODEL_MANIFEST_TTL_SECONDS
+        )
+        self.retry_seconds = retry_seconds if retry_seconds is not None else config.MODEL_MANIFEST_RETRY_SECONDS
+        self._manifest: Optional[Dict[str, ManifestEntry]] = None
+        self._manifest_read_at = 0.0
+        self._retry_at = 0.0
+        self.last_error: Optional[str] = None
+        self._manifest_lock = threading.Lock()
+
+    @abstractmethod
+    def _read_manifest_bytes(self) -> Optional[bytes]:
+        """
+        Raw manifest content
+
+        Returns:
+            Manifest bytes, or None if the store has no manifest
+        """
+        pass
+
+    @abstractmethod
+    def _fetch_file(self, entry: ManifestEntry, dest: str):
+        """
+        Copy a model file to `dest` (written atomically)
+
+        Args:
+            entry: Manifest entry of the model
+            dest: Local destination path
+        """
+        pass
+
+    def manifest(self, refresh: bool = False) -> Dict[str, ManifestEntry]:
+        """
+        Published models by partner, re-read at most every manifest_ttl_seconds.
+        A failed read is logged and answered with the last good manifest (empty
+        before the first one); it is retried after retry_seconds, not per call.
+
+        Args:
+            refresh: Re-read the manifest now
+
+        Returns:
+            Dict partner -> ManifestEntry (empty if the store has no manifest)
+        """
+        with self._manifest_lock:
+            now = time.monotonic()
+            fresh = now - self._manifest_read_at < self.manifest_ttl_seconds
+            if not refresh and (
+                (self._manifest is not None and fresh) or now < self._retry_at
+            ):
+                return self._manifest or {}
+
+            try:
+                entries = self._parse_manifest(self._read_manifest_bytes())
+            except Exception as e:
+                self._retry_at = time.monotonic() + self.retry_seconds
+                self.last_error = str(e)
+                logger.warning(
+                    "Could not read the model manifest (%s); using the last good copy", type(e).__name__
+                )
+                return self._manifest or {}
+            self._manifest = entries
+            self._manifest_read_at = time.monotonic()
+            self._retry_at = 0.0
+            self.last_error = None
+            return entries
+
+    @staticmethod
+    def _parse_manifest(raw: Optional[bytes]) -> Dict[str, ManifestEntry]:
+        entries: Dict[str, ManifestEntry] = {}
+        if raw is not None:
+            for item in json.loads(raw.decode("utf-8")).get("models", []):
+                entry = ManifestEntry(
+                    partner=item["partner"],
+                    file=item.get("file") or ManifestEntry.default_for(item["partner"]).file,
+                    version=item.get("version"),
+                    size=item.get("size"),
+                    sha256=item.get("sha256"),
+                )
+                entries[entry.partner] = entry
+        return entries
+
+    def entry_for(self, partner: str, refresh: bool = False) -> ManifestEntry:
+        """
+        Manifest entry of a partner (naming-convention entry if unlisted)
+
+        Args:
+            partner: Training partner name
+            refresh: Re-read the manifest now
+
+        Returns:
+            The partner's ManifestEntry
+        """
+        return self.manifest(refresh=refresh).get(partner) or ManifestEntry.default_for(partner)
+
+    def list_partners(self):
+        """Partners with a published model"""
+        return sorted(self.manifest())
+
+    def fetch(self, entry: ManifestEntry, dest: str):
+        """
+        Copy a model to `dest` and verify it against its manifest entry.
+        `dest` is only replaced once the copy has passed verification.
+
+        Args:
+            entry: Manifest entry of the model
+            dest: Local destination path
+        """
+        download_path = f"{dest}.download"
+        self._fetch_file(entry, download_path)
+        try:
+            verify_file(download_path, entry)
+        except IOError:
+            os.remove(download_path)
+            raise
+        os.replace(download_path, dest)
+
+
+class LocalModelStore(ModelStore):
+    """Models and manifest in a local directory (also a stand-in for Azure in tests)"""
+
+    def __init__(self, root: str, manifest_name: str = "manifest.json", **kwargs: Any):
+        super().__init__(**kwargs)
+        self.root = root
+        self.manifest_name = manifest_name
+
+    def _read_manifest_bytes(self) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self.root, self.manifest_name), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _fetch_file(self, entry: ManifestEntry, dest: str):
+        tmp_path = f"{dest}.{os.getpid()}.tmp"
+        shutil.copyfile(os.path.join(self.root, entry.file), tmp_path)
+        os.replace(tmp_path, dest)
+
+
+class AzureBlobModelStore(ModelStore):
+    """Models and manifest in an Azure Blob container, read with a SAS token"""
+
+    def __init__(
+        self,
+        base_url: str,
+        sas_token: str,
+        manifest_name: str = "manifest.json",
+        timeout: Optional[Tuple[float, float]] = None,
+        retries: Optional[int] = None,
+        pool_size: Optional[int] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+        self.sas_token = sas_token
+        self.manifest_name = manifest_name
+        self.timeout = timeout or (config.MODEL_DOWNLOAD_CONNECT_TIMEOUT, config.MODEL_DOWNLOAD_READ_TIMEOUT)
+        self.retries = retries if retries is not None else config.MODEL_DOWNLOAD_RETRIES
+        # Keep-alive connections shared by every download of this process
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size or config.DOWNLOAD_EXECUTOR_WORKERS)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def blob_url(self, name: str) -> str:
+        """
+        Full URL of a blob in the container
+
+        Args:
+            name: Blob name
+
+        Returns:
+            URL with SAS token
+        """
+        return f"{self.base_url}/{name}?{self.sas_token}"
+
+    def _read_manifest_bytes(self) -> Optional[bytes]:
+        response = self._session.get(self.blob_url(self.manifest_name), timeout=self.timeout)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.content
+
+    def _fetch_file(self, entry: ManifestEntry, dest: str):
+        """
+        Stream a blob to `dest` through a `.part` file, resuming dropped transfers
+        with Range + If-Match requests (restarting from zero if the blob changed)
+        and verifying size and Content-MD5 before the rename.
+        Caller holds the destination's file lock.
+        """
+        url = self.blob_url(entry.file)
+        part_path = f"{dest}.part"
+        etag_path = f"{part_path}.etag"
+        expected_md5: Optional[str] = None
+        total: Optional[int] = None
+
+        def discard_partial():
+            for path in (part_path, etag_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        attempt = 0
+        while True:
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            headers: Dict[str, str] = {}
+            if offset and os.path.exists(etag_path):
+                with open(etag_path, "r", encoding="utf-8") as f:
+                    # If-Match: the server answers 412 instead of a tail of a changed blob
+                    headers = {"Range": f"bytes={offset}-", "If-Match": f.read().strip()}
+            elif offset:
+                # Without an ETag the partial file cannot be matched to the blob
+                discard_partial()
+
+            try:
+                with self._session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+                    if response.status_code == 412:
+                        logger.info("Model blob changed since the partial download; restarting")
+                        discard_partial()
+                        continue
+                    if response.status_code == 416:
+                        # Nothing left past `offset`: complete if it matches the blob size
+                        total_text = response.headers.get("Content-Range", "").rsplit("/", 1)[-1]
+                        if total_text.isdigit() and int(total_text) == offset:
+                            total = offset
+                            break
+                        discard_partial()
+                        continue
+                    if response.status_code == 206:
+                        mode = "ab"
+                        content_range = response.headers.get("Content-Range", "")
+                        total_text = content_range.rsplit("/", 1)[-1]
+                        total = int(total_text) if total_text.isdigit() else None
+                    else:
+                        response.raise_for_status()
+                        mode = "wb"
+                        length = response.headers.get("Content-Length")
+                        total = int(length) if length and length.isdigit() else None
+                    expected_md5 = (
+                        response.headers.get("x-ms-blob-content-md5")
+                        or (response.headers.get("Content-MD5") if response.status_code == 200 else None)
+                    )
+                    etag = response.headers.get("ETag")
+                    if etag:
+                        with open(etag_path, "w", encoding="utf-8") as f:
+                            f.write(etag)
+                    elif os.path.exists(etag_path):
+                        os.remove(etag_path)
+
+                    with open(part_path, mode) as f:
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            if chunk:
+                                f.write(chunk)
+                break
+            except RESUMABLE_ERRORS as e:
+                if attempt == self.retries:
+                    raise
+                attempt += 1
+                received = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+                logger.warning(
+                    "Model download interrupted at %d bytes (%s); resuming (attempt %d/%d)",
+                    received, type(e).__name__, attempt, self.retries,
+                )
+                time.sleep(min(2 ** (attempt - 1), 10))
+
+        try:
+            size = os.path.getsize(part_path)
+            if total is not None and size != total:
+                raise IOError(f"Incomplete model download: {size} of {total} bytes")
+            if expected_md5:
+                digest = hashlib.md5()
+                with open(part_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                        digest.update(chunk)
+                if base64.b64encode(digest.digest()).decode("ascii") != expected_md5:
+                    raise IOError("Model download failed its Content-MD5 check")
+        except IOError:
+            # A corrupt partial file must not be resumed
+            discard_partial()
+            raise
+
+        os.replace(part_path, dest)
+        if os.path.exists(etag_path):
+            os.remove(etag_path)
+
+
+def create_model_store() -> ModelStore:
+    """Model store selected by config.MODEL_STORE_TYPE ("azure" or "local")"""
+    store_type = (config.MODEL_STORE_TYPE or "azure").lower()
+    if store_type == "local":
+        return LocalModelStore(config.LOCAL_MODEL_STORE_DIR, manifest_name=config.MODEL_MANIFEST_NAME)
+    if store_type != "azure":
+        import warnings
+        warnings.warn(f"Unknown model store type: {config.MODEL_STORE_TYPE}. Falling back to Azure blob store.")
+    return AzureBlobModelStore(
+        config.AZURE_BLOB_BASE_URL,
+        config.AZURE_BLOB_SAS_TOKEN,
+        manifest_name=config.MODEL_MANIFEST_NAME,
+    )
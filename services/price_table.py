@@ -0,0 +1,219 @@
+"""
+Precomputed XGBoost price table for every (TP, SKU) pair.
+
+The final model's features only depend on the latest row of each pair, so the
+whole catalog can be scored offline. Run nightly (cron / App Service WebJob):
+
+    python -m services.price_table --workers 4
+"""
+import argparse
+import logging
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import config
+from services.run_model import (
+    FINAL_COLUMNS_PATH,
+    FINAL_MODEL_PATH,
+    FINAL_SOURCE_DATA_PATH,
+    _format_date,
+    _load_predictor,
+    _load_remote_pickle,
+    _load_source_data,
+    artifact_fingerprint,
+    latest_rows,
+)
+from services.feature_encoder import get_feature_encoder
+
+logger = logging.getLogger(__name__)
+
+# Model and encoded columns of the current worker process (set by _init_worker)
+_worker_model: Any = None
+_worker_columns: Any = None
+
+
+def _init_worker(model: Any, feature_cols) -> None:
+    """Process pool initializer: receive the model once per worker."""
+    global _worker_model, _worker_columns
+    _worker_model = model
+    _worker_columns = feature_cols
+
+
+def _score_chunk(base_rows: pd.DataFrame) -> np.ndarray:
+    """Score a chunk of base feature rows with one model call."""
+    encoded = get_feature_encoder(_worker_columns).encode_batch(base_rows)
+    return np.asarray(_worker_model.predict(encoded), dtype=np.float64)
+
+
+def build_price_table(
+    output_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    model_path: str = FINAL_MODEL_PATH,
+    columns_path: str = FINAL_COLUMNS_PATH,
+    df_path: str = FINAL_SOURCE_DATA_PATH,
+) -> pd.DataFrame:
+    """
+    Score every (TP, SKU) pair in the source data and write the table to disk.
+
+    Args:
+        output_path: Destination file (defaults to config.PRICE_TABLE_PATH)
+        workers: Process pool size (defaults to config.PRICE_TABLE_WORKERS)
+        model_path, columns_path, df_path: Artifact URLs
+
+    Returns:
+        The price table (one row per pair)
+    """
+    output_path = output_path or config.PRICE_TABLE_PATH
+    workers = workers or config.PRICE_TABLE_WORKERS
+
+    model = _load_predictor(model_path, columns_path)
+    feature_cols = _load_remote_pickle(columns_path)
+    latest = latest_rows(_load_source_data(df_path)).reset_index(drop=True)
+
+    base_rows = pd.DataFrame(
+        {
+            "INV": 1,
+            "QTY": 1,
+            "GROSS_SALES": latest["GROSS_SALES"].to_numpy(),
+            "SKU": latest["SKU"].astype(str).to_numpy(),
+            "TP": latest["TP"].astype(str).to_numpy(),
+            "CATEGORY": latest["CATEGORY"].to_numpy(),
+        }
+    )
+
+    n_chunks = max(1, min(len(base_rows), workers * 4))
+    bounds = np.linspace(0, len(base_rows), n_chunks + 1, dtype=int)
+    chunks = [base_rows.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+    logger.info("Scoring %d (TP, SKU) pairs in %d chunks with %d workers", len(base_rows), len(chunks), workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model, feature_cols)) as pool:
+        predictions = np.concatenate(list(pool.map(_score_chunk, chunks))) if chunks else np.empty(0)
+
+    inflation = (
+        latest["INFLATION"].astype(float).to_numpy()
+        if "INFLATION" in latest.columns
+        else np.zeros(len(latest))
+    )
+    table = pd.DataFrame(
+        {
+            "TP": base_rows["TP"].astype("category"),
+            "SKU": base_rows["SKU"].astype("category"),
+            "CATEGORY": latest["CATEGORY"].astype("category"),
+            "past_period": [_format_date(value) for value in latest["DATE"]],
+            "past_price": latest["Real_price"].astype(float).to_numpy(),
+            "predicted_price": predictions,
+            "inflation": inflation,
+        }
+    )
+
+    payload = {
+        "generated_at": datetime.now().isoformat(),
+        "artifacts": artifact_fingerprint(model_path, columns_path, df_path),
+        "table": table,
+    }
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, output_path)
+    logger.info("Wrote price table with %d rows to %s", len(table), output_path)
+    return table
+
+
+class PriceTable:
+    """In-memory hash index over a precomputed price table."""
+
+    def __init__(self, table: pd.DataFrame, generated_at: str, artifacts: Optional[Dict[str, Any]] = None):
+        self.generated_at = generated_at
+        # Artifact digests and source layout the table was built from (None for older tables)
+        self.artifacts = artifacts
+        self._columns = {
+            "CATEGORY": table["CATEGORY"].astype(object).to_numpy(),
+            "past_period": table["past_period"].to_numpy(),
+            "past_price": table["past_price"].to_numpy(),
+            "predicted_price": table["predicted_price"].to_numpy(),
+            "inflation": table["inflation"].to_numpy(),
+        }
+        self._index: Dict[Tuple[str, str], int] = {
+            (str(tp), str(sku)): position
+            for position, (tp, sku) in enumerate(zip(table["TP"], table["SKU"]))
+        }
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(self, tp: str, sku: str) -> Optional[Dict[str, Any]]:
+        """Precomputed values for a pair, or None on a miss."""
+        position = self._index.get((tp, sku))
+        if position is None:
+            return None
+        return {
+            "CATEGORY": self._columns["CATEGORY"][position],
+            "past_period": str(self._columns["past_period"][position]),
+            "past_price": float(self._columns["past_price"][position]),
+            "predicted_price": float(self._columns["predicted_price"][position]),
+            "inflation": float(self._columns["inflation"][position]),
+        }
+
+
+_table_lock = threading.Lock()
+_loaded_table: Optional[PriceTable] = None
+_loaded_mtime: Optional[float] = None
+
+
+def get_price_table(path: Optional[str] = None, artifacts: Optional[Dict[str, Any]] = None) -> Optional[PriceTable]:
+    """
+    Load (or reuse) the on-disk price table; reloaded when the file changes.
+    Returns None if the table is missing, older than config.PRICE_TABLE_MAX_AGE_HOURS,
+    or (when `artifacts` is given, see run_model.artifact_fingerprint) built from
+    other artifacts.
+    """
+    global _loaded_table, _loaded_mtime
+    path = path or config.PRICE_TABLE_PATH
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    with _table_lock:
+        if _loaded_table is None or _loaded_mtime != mtime:
+            try:
+                with open(path, "rb") as f:
+                    payload = pickle.load(f)
+                _loaded_table = PriceTable(payload["table"], payload["generated_at"], payload.get("artifacts"))
+                _loaded_mtime = mtime
+            except Exception as exc:
+                logger.warning("Could not load price table from %s: %s", path, exc)
+                return None
+        table = _loaded_table
+
+    if artifacts is not None and table.artifacts != artifacts:
+        logger.debug("Price table %s was built from other artifacts; scoring live", path)
+        return None
+    max_age = timedelta(hours=config.PRICE_TABLE_MAX_AGE_HOURS)
+    if datetime.now() - datetime.fromisoformat(table.generated_at) > max_age:
+        return None
+    return table
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Precompute XGBoost prices for every (TP, SKU) pair.")
+    parser.add_argument("--output", default=config.PRICE_TABLE_PATH)
+    parser.add_argument("--workers", type=int, default=config.PRICE_TABLE_WORKERS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    build_price_table(output_path=args.output, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
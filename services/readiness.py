@@ -0,0 +1,94 @@
+"""
+Readiness tracking for artifacts warmed up at startup
+"""
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class ReadinessTracker:
+    """Records per-artifact load state and timings"""
+
+    PENDING = "pending"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._artifacts: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def _new_item(required: bool) -> Dict[str, Any]:
+        return {"state": ReadinessTracker.PENDING, "required": required, "seconds": None, "error": None}
+
+    def register(self, name: str, required: bool = True):
+        """
+        Declare an artifact loaded at startup
+
+        Args:
+            name: Artifact name
+            required: The service is not ready if this artifact failed to load
+                (optional artifacts only have to finish)
+        """
+        with self._lock:
+            self._artifacts[name] = self._new_item(required)
+
+    def _update(self, name: str, **fields: Any):
+        with self._lock:
+            self._artifacts.setdefault(name, self._new_item(True))
+            self._artifacts[name].update(fields)
+
+    def track(self, name: str, fn: Callable[[], Any]) -> Optional[Any]:
+        """
+        Run a loader and record its state and duration (errors are recorded, not raised)
+
+        Args:
+            name: Artifact name
+            fn: Zero-argument loader
+
+        Returns:
+            Loader result, or None if it failed
+        """
+        self._update(name, state=self.LOADING)
+        started = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as e:
+            # Blob URLs carry SAS tokens in the query string; never echo them
+            error = re.sub(r"\?[^\s'\"]*", "?<redacted>", str(e))
+            self._update(name, state=self.FAILED, seconds=round(time.perf_counter() - started, 3), error=error)
+            return None
+        self._update(name, state=self.READY, seconds=round(time.perf_counter() - started, 3), error=None)
+        return result
+
+    def is_ready(self) -> bool:
+        """Whether every artifact has finished loading and no required one failed"""
+        return self.snapshot()["ready"]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current readiness report
+
+        Returns:
+            Dict with "finished" (every artifact loaded or failed), "ready" (finished and
+            no required artifact failed), the failed artifacts, counts per state and
+            per-artifact details
+        """
+        with self._lock:
+            artifacts = {name: dict(item) for name, item in self._artifacts.items()}
+        counts: Dict[str, int] = {}
+        for item in artifacts.values():
+            counts[item["state"]] = counts.get(item["state"], 0) + 1
+        finished = all(item["state"] in (self.READY, self.FAILED) for item in artifacts.values())
+        failed = sorted(name for name, item in artifacts.items() if item["state"] == self.FAILED)
+        required_failed = [name for name in failed if artifacts[name]["required"]]
+        return {
+            "ready": finished and not required_failed,
+            "finished": finished,
+            "failed": failed,
+            "required_failed": required_failed,
+            "counts": counts,
+            "artifacts": artifacts,
+        }
@@ -1,17 +1,29 @@
 import logging
+import os
 import pickle
-from functools import lru_cache
-from io import BytesIO
-from typing import Any, Dict, Tuple, Union
+import threading
+import weakref
+from functools import lru_cache, wraps
+from html import escape
+from string import Template
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
-import requests
 import xgboost  # noqa: F401 - ensures pickle can import xgboost objects
 
+import config
+from services.artifact_cache import ArtifactCache
+from services.feature_encoder import get_feature_encoder
+from services.metrics import REMOTE_PICKLE_LOAD_SECONDS
+from services.source_store import load_source_frame
+from services.xgb_predictor import BoosterPredictor, is_native_model
+from utils.singleflight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
-FINAL_MODEL_PATH = (
+FINAL_MODEL_PATH = config.XGB_NATIVE_MODEL_URL or (
     "https://modelstoragest.blob.core.windows.net/models/final_xgb_model.pkl?"
     "sp=r&st=2025-12-02T03:34:14Z&se=2026-01-16T11:49:14Z&sv=2024-11-04&sr=b&"
     "sig=0RIRxO3ObExUaEeTSwkjCUkjALTt7z%2BmDlifnZVlecU%3D"
@@ -27,21 +39,139 @@ FINAL_SOURCE_DATA_PATH = (
     "sig=NMp6i38erBfXcrkBRYD15gmAjifrjCTC2v7835ez8Fo%3D"
 )
 
+FINAL_ARTIFACTS: Dict[str, str] = {
+    "xgb_model": FINAL_MODEL_PATH,
+    "xgb_columns": FINAL_COLUMNS_PATH,
+    "xgb_source_data": FINAL_SOURCE_DATA_PATH,
+}
+
+# Source columns read by price_comparison_table, latest_rows and the batch statement
+SOURCE_COLUMNS = ["TP", "SKU", "CATEGORY", "DATE", "GROSS_SALES", "Real_price", "INFLATION"]
+# GROSS_SALES only feeds the model, which works in float32; prices keep float64 for display
+SOURCE_FLOAT32_COLUMNS = ["GROSS_SALES"]
+
+_artifact_cache = ArtifactCache(
+    cache_dir=config.ARTIFACT_CACHE_DIR,
+    max_bytes=config.ARTIFACT_CACHE_MAX_MB * 1024 * 1024,
+)
+_load_flight = SingleFlight()
+# resource key -> SHA-256 of the artifact content loaded in this process
+_loaded_digests: Dict[str, str] = {}
+
+
+def _record_digest(url: str, path: str) -> None:
+    _loaded_digests[ArtifactCache.resource_key(url)] = ArtifactCache.blob_sha256(path)
+
+
+def _coalesced(fn):
+    """Concurrent first calls with the same arguments (boot prefetch, first click) share one load."""
+
+    @wraps(fn)
+    def wrapper(*args):
+        return _load_flight.do((fn.__name__,) + args, fn, *args)
+
+    return wrapper
+
 
 @lru_cache(maxsize=16)
+@_coalesced
 def _load_remote_pickle(url: str):
     """
     Download a pickle file from Azure Blob Storage and deserialize it.
-    Cached to avoid repeated downloads across reruns.
+    Cached in-process across reruns and on disk across restarts
+    (the disk copy is revalidated with ETag/Last-Modified).
     """
-    logger.info("Downloading pickle resource from %s", url)
-    response = requests.get(url, timeout=60)
-    response.raise_for_status()
-    obj = pickle.load(BytesIO(response.content))
-    logger.debug("Loaded pickle from %s (type=%s)", url, type(obj))
+    artifact = ArtifactCache.resource_key(url).rsplit("/", 1)[-1]
+    logger.info("Loading pickle resource %s", artifact)
+    with REMOTE_PICKLE_LOAD_SECONDS.time(artifact=artifact):
+        path = _artifact_cache.fetch(url, timeout=60)
+        with open(path, "rb") as f:
+            obj = pickle.load(f)
+        _record_digest(url, path)
+    logger.debug("Loaded pickle %s (type=%s)", artifact, type(obj))
     return obj
 
 
+@lru_cache(maxsize=4)
+@_coalesced
+def _load_source_data(url: str) -> pd.DataFrame:
+    """
+    Load the source DataFrame through its memory-mapped columnar copy
+    (converted and compacted to SOURCE_COLUMNS from the cached pickle on first use).
+    """
+    artifact = ArtifactCache.resource_key(url).rsplit("/", 1)[-1]
+    logger.info("Loading source data %s", artifact)
+    with REMOTE_PICKLE_LOAD_SECONDS.time(artifact=artifact):
+        path = _artifact_cache.fetch(url, timeout=60)
+        df = load_source_frame(
+            path,
+            os.path.join(config.ARTIFACT_CACHE_DIR, "columnar"),
+            columns=SOURCE_COLUMNS,
+            float32_columns=SOURCE_FLOAT32_COLUMNS,
+        )
+        _record_digest(url, path)
+    logger.debug("Loaded source data %s (%d rows)", artifact, len(df))
+    return df
+
+
+@lru_cache(maxsize=4)
+@_coalesced
+def _load_predictor(model_url: str, columns_url: str) -> BoosterPredictor:
+    """
+    Load the model as a native booster predictor, validated once against the
+    encoded columns. JSON/UBJ models (.json/.ubj) are loaded natively; pickled
+    sklearn wrappers are unpickled and their booster extracted.
+    """
+    artifact = ArtifactCache.resource_key(model_url).rsplit("/", 1)[-1]
+    logger.info("Loading XGBoost booster %s", artifact)
+    with REMOTE_PICKLE_LOAD_SECONDS.time(artifact=artifact):
+        path = _artifact_cache.fetch(model_url, timeout=60)
+        feature_cols = _load_remote_pickle(columns_url)
+        predictor = BoosterPredictor.from_file(
+            path,
+            feature_cols,
+            native=is_native_model(model_url),
+            n_threads=config.XGB_PREDICT_THREADS,
+        )
+        _record_digest(model_url, path)
+    logger.debug("Loaded booster %s (%d features)", artifact, len(predictor.feature_names))
+    return predictor
+
+
+def load_final_artifact(name: str):
+    """Load (and cache) one of the final XGBoost artifacts by name."""
+    if name == "xgb_model":
+        return _load_predictor(FINAL_MODEL_PATH, FINAL_COLUMNS_PATH)
+    if name == "xgb_source_data":
+        return _load_source_data(FINAL_ARTIFACTS[name])
+    return _load_remote_pickle(FINAL_ARTIFACTS[name])
+
+
+def artifact_fingerprint(
+    model_path: str = FINAL_MODEL_PATH,
+    columns_path: str = FINAL_COLUMNS_PATH,
+    df_path: str = FINAL_SOURCE_DATA_PATH,
+) -> Dict[str, Any]:
+    """
+    Identity of the artifacts a prediction is computed from (loading them if needed):
+    the SHA-256 of the model, encoded columns and source data loaded in this process,
+    plus the source column layout.
+    """
+    _load_predictor(model_path, columns_path)
+    _load_source_data(df_path)
+    return {
+        "xgb_model": _loaded_digests[ArtifactCache.resource_key(model_path)],
+        "xgb_columns": _loaded_digests[ArtifactCache.resource_key(columns_path)],
+        "xgb_source_data": _loaded_digests[ArtifactCache.resource_key(df_path)],
+        "source_columns": list(SOURCE_COLUMNS),
+    }
+
+
+def artifact_download_progress(name: str) -> Optional[Tuple[int, Optional[int]]]:
+    """(bytes received, total bytes or None) while a final artifact downloads in this process."""
+    return _artifact_cache.progress(FINAL_ARTIFACTS[name])
+
+
 def _format_date(value: Union[str, datetime, pd.Timestamp]) -> str:
     """Convert timestamps/strings to YYYY-MM-DD strings."""
     if isinstance(value, pd.Timestamp):
@@ -51,6 +181,128 @@ def _format_date(value: Union[str, datetime, pd.Timestamp]) -> str:
     return str(value)
 
 
+def _format_prediction_date(prediction_date: Union[str, datetime]) -> str:
+    return (
+        prediction_date.strftime("%Y-%m-%d")
+        if hasattr(prediction_date, "strftime")
+        else str(prediction_date)
+    )
+
+
+class LatestRowIndex:
+    """Índice (TP, SKU) -> posición del último registro (por DATE) en el DataFrame."""
+
+    def __init__(self, df: pd.DataFrame):
+        order = df["DATE"].reset_index(drop=True).sort_values(kind="stable").index.to_numpy()
+        keys = pd.DataFrame(
+            {
+                "TP": df["TP"].to_numpy()[order],
+                "SKU": df["SKU"].to_numpy()[order],
+                "position": order,
+            }
+        )
+        last = keys.groupby(["TP", "SKU"], sort=False, observed=True)["position"].last()
+        self._positions: Dict[Tuple[Any, Any], int] = dict(zip(last.index, last.to_numpy().tolist()))
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def get(self, tp: str, sku: str) -> Optional[int]:
+        """Posición del último registro del par, o None si no hay historia."""
+        return self._positions.get((tp, sku))
+
+    def positions(self) -> np.ndarray:
+        """Posiciones de todos los últimos registros."""
+        return np.fromiter(self._positions.values(), dtype=np.int64, count=len(self._positions))
+
+
+# id(df) -> (weakref to df, index); a new artifact is a new DataFrame, so it gets a new index
+_latest_indexes: Dict[int, Tuple[weakref.ref, LatestRowIndex]] = {}
+_latest_indexes_lock = threading.Lock()
+
+
+def latest_row_index(df: pd.DataFrame) -> LatestRowIndex:
+    """Índice de últimos registros de `df`, construido una sola vez por DataFrame."""
+    key = id(df)
+    with _latest_indexes_lock:
+        cached = _latest_indexes.get(key)
+        if cached is not None and cached[0]() is df:
+            return cached[1]
+
+    index = LatestRowIndex(df)
+    with _latest_indexes_lock:
+        _latest_indexes[key] = (weakref.ref(df, lambda _ref: _latest_indexes.pop(key, None)), index)
+    logger.debug("Built latest-row index for %d (TP, SKU) pairs", len(index))
+    return index
+
+
+def latest_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Último registro (por DATE) de cada par (TP, SKU)."""
+    return df.iloc[latest_row_index(df).positions()]
+
+
+def _build_statement(
+    sku: str,
+    tp: str,
+    category: Any,
+    past_period: str,
+    past_price: float,
+    pred_date: str,
+    pred_price: float,
+    inflation: float,
+) -> Dict[str, Any]:
+    """Arma el statement con valores crudos (el HTML se genera aparte con render_statement_html)."""
+    pct_change = (
+        ((pred_price - past_price) / past_price) * 100 if past_price != 0 else None
+    )
+    return {
+        "sku": sku,
+        "tp": tp,
+        "category": category,
+        "prediction_date": pred_date,
+        "past_period": past_period,
+        "past_price": past_price,
+        "predicted_price": pred_price,
+        "pct_change": pct_change,
+        "inflation": inflation,
+    }
+
+
+_STATEMENT_TEMPLATE = Template(
+    '<table class="prediction-statement">'
+    "<caption>Showing $tp_upper – $sku for $prediction_date</caption>"
+    "<thead><tr>"
+    "<th>SKU</th><th>CATEGORY</th><th>Past Period</th><th>Past Price/Unit</th>"
+    "<th>Prediction Date</th><th>Predicted Price/Unit</th><th>% Change</th><th>INF</th>"
+    "</tr></thead>"
+    "<tbody><tr>"
+    "<td>$sku</td><td>$category</td>"
+    '<td style="background-color: gray; color: white;">$past_period</td>'
+    '<td style="background-color: gray; color: white;">$past_price</td>'
+    '<td style="background-color: #FFC700; color: white;">$prediction_date</td>'
+    '<td style="background-color: #FFC700; color: white;">$predicted_price</td>'
+    "<td>$pct_change</td><td>$inflation</td>"
+    "</tr></tbody>"
+    "</table>"
+)
+
+
+def render_statement_html(statement: Dict[str, Any]) -> str:
+    """Genera el HTML de la tabla de comparación de un statement."""
+    pct_change = statement.get("pct_change")
+    return _STATEMENT_TEMPLATE.substitute(
+        tp_upper=escape(str(statement["tp"]).upper()),
+        sku=escape(str(statement["sku"])),
+        category=escape(str(statement["category"])),
+        past_period=escape(str(statement["past_period"])),
+        past_price=f"{statement['past_price']:,.2f}",
+        prediction_date=escape(str(statement["prediction_date"])),
+        predicted_price=f"{statement['predicted_price']:,.2f}",
+        pct_change=f"{pct_change:,.2f}%" if pct_change is not None else "—",
+        inflation=f"{statement['inflation']:,.6f}",
+    )
+
+
 def price_comparison_table(
     df: pd.DataFrame,
     model: Any,
@@ -58,79 +310,44 @@ def price_comparison_table(
     tp: str,
     sku: str,
     pred_date: str,
-) -> Tuple[pd.DataFrame, str]:
+) -> Dict[str, Any]:
     """
-    Construye la tabla de comparación entre el último precio y la predicción.
-    Devuelve el DataFrame listo para usarse y el HTML estilizado.
+    Compara el último precio del par (TP, SKU) con la predicción del modelo.
+    Devuelve el statement con valores crudos.
     """
-    latest_rows = df[(df["TP"] == tp) & (df["SKU"] == sku)].sort_values("DATE")
-    if latest_rows.empty:
+    position = latest_row_index(df).get(tp, sku)
+    if position is None:
         raise ValueError(f"No history for SKU={sku} with TP={tp}")
 
-    past = latest_rows.iloc[-1]
+    past = df.iloc[position]
     past_price = float(past["Real_price"])
     past_period = _format_date(past["DATE"])
     category = past["CATEGORY"]
     inflation = float(past.get("INFLATION", 0.0))
 
-    base_row = pd.DataFrame(
-        [
-            {
-                "INV": 1,
-                "QTY": 1,
-                "GROSS_SALES": past["GROSS_SALES"],
-                "SKU": sku,
-                "TP": tp,
-                "CATEGORY": category,
-            }
-        ]
-    )
-
-    encoded_row = (
-        pd.get_dummies(base_row, columns=["SKU", "TP", "CATEGORY"])
-        .reindex(columns=feature_cols, fill_value=0)
-    )
-
-    pred_price = float(model.predict(encoded_row)[0])
-    pct_change = (
-        ((pred_price - past_price) / past_price) * 100 if past_price != 0 else None
-    )
-
-    result_df = pd.DataFrame(
+    encoded_row = get_feature_encoder(feature_cols).encode(
         {
-            "SKU": [sku],
-            "CATEGORY": [category],
-            "Past Period": [past_period],
-            "Past Price/Unit": [past_price],
-            "Prediction Date": [pred_date],
-            "Predicted Price/Unit": [pred_price],
-            "% Change": [pct_change],
-            "INF": [inflation],
+            "INV": 1,
+            "QTY": 1,
+            "GROSS_SALES": past["GROSS_SALES"],
+            "SKU": sku,
+            "TP": tp,
+            "CATEGORY": category,
         }
     )
 
-    styler = (
-        result_df.style.set_properties(
-            subset=["Past Period", "Past Price/Unit"],
-            **{"background-color": "gray", "color": "white"},
-        )
-        .set_properties(
-            subset=["Prediction Date", "Predicted Price/Unit"],
-            **{"background-color": "#FFC700", "color": "white"},
-        )
-        .format(
-            {
-                "Past Price/Unit": "{:,.2f}".format,
-                "Predicted Price/Unit": "{:,.2f}".format,
-                "% Change": (lambda x: f"{x:,.2f}%" if x is not None else "—"),
-                "INF": "{:,.6f}".format,
-            }
-        )
-        .set_caption(f"Showing {tp.upper()} – {sku} for {pred_date}")
-    )
+    pred_price = float(model.predict(encoded_row)[0])
 
-    table_html = styler.to_html()
-    return result_df, table_html
+    return _build_statement(
+        sku=sku,
+        tp=tp,
+        category=category,
+        past_period=past_period,
+        past_price=past_price,
+        pred_date=pred_date,
+        pred_price=pred_price,
+        inflation=inflation,
+    )
 
 
 def generate_price_prediction_statement(
@@ -142,19 +359,42 @@ def generate_price_prediction_statement(
     df_path: str = FINAL_SOURCE_DATA_PATH,
 ) -> Dict[str, Any]:
     """
-    Ejecuta el modelo final y devuelve un statement listo para mostrarse.
+    Ejecuta el modelo final y devuelve el statement (valores crudos; ver
+    render_statement_html para la tabla HTML).
+    Con los artefactos por defecto se sirve primero desde la tabla de precios
+    precalculada (services.price_table) y solo se puntúa en vivo si no hay fila.
     """
-    pred_date = (
-        prediction_date.strftime("%Y-%m-%d")
-        if hasattr(prediction_date, "strftime")
-        else str(prediction_date)
-    )
+    pred_date = _format_prediction_date(prediction_date)
+
+    precomputed = None
+    if (model_path, columns_path, df_path) == (
+        FINAL_MODEL_PATH,
+        FINAL_COLUMNS_PATH,
+        FINAL_SOURCE_DATA_PATH,
+    ):
+        from services.price_table import get_price_table
+
+        # A table built from other artifacts than the ones loaded here would disagree with live scoring
+        price_table = get_price_table(artifacts=artifact_fingerprint())
+        precomputed = price_table.lookup(tp, sku) if price_table is not None else None
+
+    if precomputed is not None:
+        return _build_statement(
+            sku=sku,
+            tp=tp,
+            category=precomputed["CATEGORY"],
+            past_period=precomputed["past_period"],
+            past_price=precomputed["past_price"],
+            pred_date=pred_date,
+            pred_price=precomputed["predicted_price"],
+            inflation=precomputed["inflation"],
+        )
 
-    trained_model = _load_remote_pickle(model_path)
+    trained_model = _load_predictor(model_path, columns_path)
     encoded_columns = _load_remote_pickle(columns_path)
-    df_source = _load_remote_pickle(df_path)
-    
-    result_df, table_html = price_comparison_table(
+    df_source = _load_source_data(df_path)
+
+    return price_comparison_table(
         df=df_source,
         model=trained_model,
         feature_cols=encoded_columns,
@@ -163,19 +403,192 @@ def generate_price_prediction_statement(
         pred_date=pred_date,
     )
 
-    row = result_df.iloc[0]
-    pct_change = row["% Change"]
 
-    return {
-        "table_df": result_df,
-        "table_html": table_html,
-        "sku": sku,
-        "tp": tp,
-        "category": row["CATEGORY"],
-        "prediction_date": pred_date,
-        "past_period": row["Past Period"],
-        "past_price": row["Past Price/Unit"],
-        "predicted_price": row["Predicted Price/Unit"],
-        "pct_change": pct_change,
-        "inflation": row["INF"],
-    }
\ No newline at end of file
+def generate_price_prediction_statements(
+    items: Sequence[Tuple[str, str, Union[str, datetime]]],
+    model_path: str = FINAL_MODEL_PATH,
+    columns_path: str = FINAL_COLUMNS_PATH,
+    df_path: str = FINAL_SOURCE_DATA_PATH,
+) -> Dict[str, Any]:
+    """
+    Versión por lotes de generate_price_prediction_statement: una sola matriz
+    de features y una sola llamada al modelo para todos los (sku, tp, fecha).
+
+    Returns:
+        Dict con "table_df" (una fila por item con historia, en el orden de
+        entrada, mismas columnas que el statement individual más "TP") y
+        "missing" (pares (sku, tp) sin historia)
+    """
+    trained_model = _load_predictor(model_path, columns_path)
+    encoded_columns = _load_remote_pickle(columns_path)
+    df_source = _load_source_data(df_path)
+    index = latest_row_index(df_source)
+
+    positions: List[int] = []
+    found: List[Tuple[str, str, str]] = []
+    missing: List[Tuple[str, str]] = []
+    for sku, tp, prediction_date in items:
+        position = index.get(tp, sku)
+        if position is None:
+            missing.append((sku, tp))
+            continue
+        positions.append(position)
+        found.append((sku, tp, _format_prediction_date(prediction_date)))
+
+    rows = df_source.iloc[positions]
+    skus = [sku for sku, _, _ in found]
+    tps = [tp for _, tp, _ in found]
+    categories = rows["CATEGORY"].to_numpy()
+
+    features = get_feature_encoder(encoded_columns).encode_batch(
+        {
+            "INV": np.ones(len(found)),
+            "QTY": np.ones(len(found)),
+            "GROSS_SALES": rows["GROSS_SALES"].to_numpy(),
+            "SKU": skus,
+            "TP": tps,
+            "CATEGORY": categories,
+        }
+    )
+    pred_prices = (
+        np.asarray(trained_model.predict(features), dtype=np.float64)
+        if found
+        else np.empty(0)
+    )
+
+    past_prices = rows["Real_price"].to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct_change = np.where(
+            past_prices != 0, (pred_prices - past_prices) / past_prices * 100, np.nan
+        )
+    inflation = (
+        rows["INFLATION"].to_numpy(dtype=np.float64)
+        if "INFLATION" in rows.columns
+        else np.zeros(len(found))
+    )
+
+    table_df = pd.DataFrame(
+        {
+            "SKU": skus,
+            "TP": tps,
+            "CATEGORY": categories,
+            "Past Period": [_format_date(value) for value in rows["DATE"]],
+            "Past Price/Unit": past_prices,
+            "Prediction Date": [pred_date for _, _, pred_date in found],
+            "Predicted Price/Unit": pred_prices,
+            "% Change": pct_change,
+            "INF": inflation,
+        }
+    )
+    return {"table_df": table_df, "missing": missing}
+
+
+SWEEP_FEATURES = ("GROSS_SALES", "QTY", "INV")
+
+
+def sweep_price_predictions(
+    pairs: Sequence[Tuple[str, str]],
+    grid: Dict[str, Sequence[float]],
+    model_path: str = FINAL_MODEL_PATH,
+    columns_path: str = FINAL_COLUMNS_PATH,
+    df_path: str = FINAL_SOURCE_DATA_PATH,
+) -> Dict[str, Any]:
+    """
+    Barrido what-if: predice el precio de cada par (sku, tp) para todas las
+    combinaciones de valores de `grid`, en bloques de filas cuya matriz de
+    features no pasa de config.SWEEP_CHUNK_MB.
+    Las features fuera de `grid` conservan los valores de price_comparison_table
+    (INV=1, QTY=1, GROSS_SALES del último registro).
+
+    Args:
+        pairs: Pares (sku, tp)
+        grid: Feature de SWEEP_FEATURES -> valores a probar
+
+    Returns:
+        Dict con "table_df" (una fila por par y escenario: SKU, TP, CATEGORY,
+        GROSS_SALES, QTY, INV, Past Price/Unit, Predicted Price/Unit, % Change)
+        y "missing" (pares sin historia)
+    """
+    unknown = sorted(set(grid) - set(SWEEP_FEATURES))
+    if unknown:
+        raise ValueError(f"Unknown sweep features {unknown}; expected {list(SWEEP_FEATURES)}")
+    empty = sorted(name for name, values in grid.items() if len(values) == 0)
+    if empty:
+        raise ValueError(f"Empty value list for sweep features {empty}")
+
+    trained_model = _load_predictor(model_path, columns_path)
+    encoded_columns = _load_remote_pickle(columns_path)
+    df_source = _load_source_data(df_path)
+    index = latest_row_index(df_source)
+
+    positions: List[int] = []
+    found: List[Tuple[str, str]] = []
+    missing: List[Tuple[str, str]] = []
+    for sku, tp in pairs:
+        position = index.get(tp, sku)
+        if position is None:
+            missing.append((sku, tp))
+        else:
+            positions.append(position)
+            found.append((sku, tp))
+
+    rows = df_source.iloc[positions]
+    skus = np.array([sku for sku, _ in found], dtype=object)
+    tps = np.array([tp for _, tp in found], dtype=object)
+    categories = rows["CATEGORY"].to_numpy()
+    base_values = {
+        "GROSS_SALES": rows["GROSS_SALES"].to_numpy(dtype=np.float64),
+        "QTY": np.ones(len(found)),
+        "INV": np.ones(len(found)),
+    }
+
+    # Cartesian product of the grid, the same scenarios for every pair
+    swept = [name for name in SWEEP_FEATURES if name in grid]
+    mesh = np.meshgrid(*(np.asarray(grid[name], dtype=np.float64) for name in swept), indexing="ij")
+    scenarios = {name: axis.ravel() for name, axis in zip(swept, mesh)}
+    n_scenarios = int(np.prod([len(grid[name]) for name in swept])) if swept else 1
+
+    # One-hot part encoded once per pair, then repeated per scenario
+    encoder = get_feature_encoder(encoded_columns)
+    pair_features = encoder.encode_batch(
+        dict(base_values, SKU=skus, TP=tps, CATEGORY=categories)
+    )
+    pair_index = np.repeat(np.arange(len(found)), n_scenarios)
+
+    values: Dict[str, np.ndarray] = {}
+    for name in SWEEP_FEATURES:
+        if name in scenarios:
+            values[name] = np.tile(scenarios[name], len(found))
+        else:
+            values[name] = base_values[name][pair_index]
+
+    # The dense matrix is built one chunk at a time (n_rows x n_features float32)
+    chunk_rows = max(1, config.SWEEP_CHUNK_MB * 1024 * 1024 // (4 * max(1, encoder.n_features)))
+    pred_prices = np.empty(len(pair_index), dtype=np.float64)
+    for start in range(0, len(pair_index), chunk_rows):
+        stop = min(start + chunk_rows, len(pair_index))
+        features = pair_features[pair_index[start:stop]]
+        for name, position in encoder.numeric_positions.items():
+            if name in values:
+                features[:, position] = values[name][start:stop]
+        pred_prices[start:stop] = trained_model.predict(features)
+    past_prices = rows["Real_price"].to_numpy(dtype=np.float64)[pair_index]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct_change = np.where(
+            past_prices != 0, (pred_prices - past_prices) / past_prices * 100, np.nan
+        )
+
+    table_df = pd.DataFrame(
+        {
+            "SKU": skus[pair_index],
+            "TP": tps[pair_index],
+            "CATEGORY": categories[pair_index],
+            "GROSS_SALES": values["GROSS_SALES"],
+            "QTY": values["QTY"],
+            "INV": values["INV"],
+            "Past Price/Unit": past_prices,
+            "Predicted Price/Unit": pred_prices,
+            "% Change": pct_change,
+        }
+    )
+    return {"table_df": table_df, "missing": missing}
@@ -0,0 +1,217 @@
+"""
+Memory-mapped columnar copy of the XGBoost source DataFrame.
+
+The pickled source frame is converted once into one ``.npy`` file per column
+(string columns such as SKU/TP/CATEGORY become category codes, in the
+smallest integer dtype pandas picks, plus a category list). Later loads ``np.load(mmap_mode="r")`` the columns, so they are
+near-instant and the pages live in the OS page cache, shared by the Streamlit
+and backend processes instead of being copied into each heap.
+
+Before conversion the frame can be compacted (see compact_frame): unused
+columns are dropped and numerics downcast, shrinking both the copy and the
+pages every process maps.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.file_lock import file_lock
+
+logger = logging.getLogger(__name__)
+
+# 2: category codes kept in their native dtype (int32 codes were copied by from_codes)
+FORMAT_VERSION = 2
+
+
+def _column_file(directory: str, position: int, suffix: str) -> str:
+    return os.path.join(directory, f"{position:04d}.{suffix}.npy")
+
+
+def _has_current_copy(directory: str) -> bool:
+    """Whether `directory` holds a complete copy in the current format."""
+    try:
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            return json.load(f).get("format_version") == FORMAT_VERSION
+    except (OSError, ValueError):
+        return False
+
+
+def _is_plain_numeric(series: pd.Series) -> bool:
+    """Numeric/bool/naive datetime columns backed by a plain NumPy dtype."""
+    return isinstance(series.dtype, np.dtype) and series.dtype.kind in "biufM"
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    columns: Sequence[str],
+    float32_columns: Sequence[str] = (),
+) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    Shrink a frame to what its readers need: keep only `columns` (those present),
+    turn string columns into categoricals, downcast integers losslessly and the
+    float columns listed in `float32_columns` to float32.
+
+    Args:
+        df: Source frame
+        columns: Columns to keep, in order
+        float32_columns: Float columns whose readers only need float32 precision
+
+    Returns:
+        Compacted frame and a report with "bytes_before" and "bytes_after"
+    """
+    bytes_before = int(df.memory_usage(deep=True).sum())
+
+    data: Dict[str, Any] = {}
+    for name in columns:
+        if name not in df.columns:
+            continue
+        series = df[name]
+        if _is_plain_numeric(series):
+            if series.dtype.kind == "i":
+                series = pd.to_numeric(series, downcast="integer")
+            elif series.dtype.kind == "u":
+                series = pd.to_numeric(series, downcast="unsigned")
+            elif series.dtype.kind == "f" and name in float32_columns:
+                series = series.astype(np.float32)
+        elif not pd.api.types.is_numeric_dtype(series.dtype):
+            series = series.astype(str).where(series.notna()).astype("category")
+        data[name] = series
+
+    compact = pd.DataFrame(data, index=df.index)
+    bytes_after = int(compact.memory_usage(deep=True).sum())
+    return compact, {"bytes_before": bytes_before, "bytes_after": bytes_after}
+
+
+def write_columnar(df: pd.DataFrame, directory: str, extra_meta: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Write a DataFrame as memory-mappable columns (atomically replaces `directory`).
+
+    Args:
+        df: Source frame
+        directory: Destination directory
+        extra_meta: Additional entries stored in meta.json
+    """
+    tmp_dir = f"{directory}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    columns: List[Dict[str, Any]] = []
+    for position, name in enumerate(df.columns):
+        series = df[name]
+        if _is_plain_numeric(series):
+            np.save(_column_file(tmp_dir, position, "values"), series.to_numpy())
+            columns.append({"name": str(name), "kind": "values"})
+        elif pd.api.types.is_numeric_dtype(series.dtype):
+            # Nullable extension dtypes (Int64, Float64...) are stored as float64 with NaN
+            np.save(
+                _column_file(tmp_dir, position, "values"),
+                series.to_numpy(dtype=np.float64, na_value=np.nan),
+            )
+            columns.append({"name": str(name), "kind": "values"})
+        else:
+            categorical = series.astype(str).where(series.notna()).astype("category")
+            # Native code dtype: from_codes keeps it as is, so the codes stay memory-mapped
+            np.save(_column_file(tmp_dir, position, "codes"), categorical.cat.codes.to_numpy())
+            columns.append(
+                {
+                    "name": str(name),
+                    "kind": "categorical",
+                    "categories": [str(value) for value in categorical.cat.categories],
+                }
+            )
+
+    meta = {"format_version": FORMAT_VERSION, "rows": len(df), "columns": columns}
+    meta.update(extra_meta or {})
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_dir, directory)
+
+
+def read_columnar(directory: str) -> pd.DataFrame:
+    """
+    Open a columnar copy as a DataFrame whose numeric columns and category
+    codes are read-only memory maps.
+
+    Args:
+        directory: Directory written by write_columnar
+
+    Returns:
+        Source DataFrame
+    """
+    with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar format in {directory}")
+
+    data: Dict[str, Any] = {}
+    for position, column in enumerate(meta["columns"]):
+        if column["kind"] == "values":
+            data[column["name"]] = np.load(_column_file(directory, position, "values"), mmap_mode="r")
+        else:
+            codes = np.load(_column_file(directory, position, "codes"), mmap_mode="r")
+            data[column["name"]] = pd.Categorical.from_codes(
+                codes, categories=column["categories"], validate=False
+            )
+    return pd.DataFrame(data, copy=False)
+
+
+def load_source_frame(
+    pickle_path: str,
+    columnar_root: str,
+    columns: Optional[Sequence[str]] = None,
+    float32_columns: Sequence[str] = (),
+) -> pd.DataFrame:
+    """
+    Load the source frame from its memory-mapped columnar copy, converting the
+    pickle on first use. The copy is keyed by the pickle's file name, which in
+    the artifact cache is its content hash, so a new artifact gets a new copy.
+
+    Args:
+        pickle_path: Local path of the pickled DataFrame
+        columnar_root: Directory holding columnar copies
+        columns: If given, compact the frame to these columns before converting
+            (see compact_frame); the bytes saved are logged and kept in meta.json
+        float32_columns: Float columns compact_frame may downcast to float32
+
+    Returns:
+        Source DataFrame backed by memory maps
+    """
+    key = os.path.basename(pickle_path)
+    if columns is not None:
+        layout = json.dumps([list(columns), sorted(float32_columns)])
+        key = f"{key}.{hashlib.sha1(layout.encode('utf-8')).hexdigest()[:8]}"
+    directory = os.path.join(columnar_root, key)
+    with file_lock(os.path.join(columnar_root, ".convert.lock")):
+        if not _has_current_copy(directory):
+            logger.info("Converting %s to columnar format in %s", pickle_path, directory)
+            with open(pickle_path, "rb") as f:
+                df = pickle.load(f)
+            extra_meta = None
+            if columns is not None:
+                df, report = compact_frame(df, columns, float32_columns)
+                saved = report["bytes_before"] - report["bytes_after"]
+                logger.info(
+                    "Compacted source frame from %.1f MB to %.1f MB (%.1f MB saved)",
+                    report["bytes_before"] / 1e6,
+                    report["bytes_after"] / 1e6,
+                    saved / 1e6,
+                )
+                extra_meta = {"compaction": dict(report, bytes_saved=saved)}
+            write_columnar(df, directory, extra_meta=extra_meta)
+            del df
+            # Older copies belong to superseded artifacts; processes still mapping
+            # them keep their pages until they reload
+            for name in os.listdir(columnar_root):
+                stale = os.path.join(columnar_root, name)
+                if name != key and os.path.isdir(stale) and not name.endswith(".tmp"):
+                    shutil.rmtree(stale, ignore_errors=True)
+    return read_columnar(directory)
@@ -0,0 +1,140 @@
+"""
+Background training service - runs model training jobs off the request path
+"""
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional
+import config
+
+
+class TrainingJob:
+    """A single training job and its lifecycle state"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    def __init__(self, key: Hashable, target: Callable[[], Any], description: str = ""):
+        self.job_id = uuid.uuid4().hex
+        self.key = key
+        self.target = target
+        self.description = description
+        self.status = self.QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished, successfully or not"""
+        return self.status in (self.SUCCEEDED, self.FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable job status (without the result payload)"""
+        return {
+            "job_id": self.job_id,
+            "description": self.description,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class TrainingService:
+    """Job queue plus worker pool for model training"""
+
+    def __init__(self, num_workers: Optional[int] = None, history_size: Optional[int] = None):
+        self.num_workers = num_workers or config.TRAINING_WORKERS
+        self.history_size = history_size or config.TRAINING_JOB_HISTORY
+        self._queue: "queue.Queue[TrainingJob]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, TrainingJob]" = OrderedDict()
+        self._active_by_key: Dict[Hashable, TrainingJob] = {}
+        self._workers: List[threading.Thread] = []
+
+    def _ensure_workers(self):
+        """Start the worker pool on first use"""
+        if self._workers:
+            return
+        for idx in range(self.num_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"training-worker-{idx}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, key: Hashable, target: Callable[[], Any], description: str = "") -> TrainingJob:
+        """
+        Queue a training job, reusing a queued/running job with the same key
+
+        Args:
+            key: Dedupe key identifying what is trained (e.g. (sku, region))
+            target: Callable that performs the training; its return value is the job result
+            description: Human readable description for status endpoints
+
+        Returns:
+            The new job, or the already active job for the same key
+        """
+        with self._lock:
+            active = self._active_by_key.get(key)
+            if active is not None and not active.done:
+                return active
+
+            job = TrainingJob(key, target, description)
+            self._active_by_key[key] = job
+            self._jobs[job.job_id] = job
+            self._trim_history()
+            self._ensure_workers()
+
+        self._queue.put(job)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[TrainingJob]:
+        """Get a job by id (None if unknown or evicted from history)"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Status of all retained jobs, newest first"""
+        with self._lock:
+            return [job.to_dict() for job in reversed(self._jobs.values())]
+
+    def is_active(self, key: Hashable) -> bool:
+        """Whether a job for the key is queued or running"""
+        with self._lock:
+            job = self._active_by_key.get(key)
+            return job is not None and not job.done
+
+    def _trim_history(self):
+        """Drop the oldest finished jobs beyond the history size (lock held)"""
+        excess = len(self._jobs) - self.history_size
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.done][:excess]:
+            del self._jobs[job_id]
+
+    def _worker_loop(self):
+        """Pull jobs from the queue and run them forever"""
+        while True:
+            job = self._queue.get()
+            job.status = TrainingJob.RUNNING
+            job.started_at = datetime.now().isoformat()
+            try:
+                job.result = job.target()
+                job.status = TrainingJob.SUCCEEDED
+            except Exception as e:
+                job.error = str(e)
+                job.status = TrainingJob.FAILED
+            finally:
+                job.finished_at = datetime.now().isoformat()
+                job.target = None
+                with self._lock:
+                    if self._active_by_key.get(job.key) is job:
+                        del self._active_by_key[job.key]
+                self._queue.task_done()
@@ -0,0 +1,132 @@
+"""
+Native XGBoost booster serving for the final price model.
+
+The booster is loaded from XGBoost's own JSON/UBJ format (or extracted once
+from the pickled sklearn wrapper), its feature names are checked against the
+encoded-columns list at load time, and predictions go straight through
+``Booster.inplace_predict`` on NumPy / SciPy CSR inputs, skipping the pandas
+conversion and per-call feature validation of ``XGBRegressor.predict``.
+
+Export a pickled model once with:
+
+    python -m services.xgb_predictor final_xgb_model.pkl final_xgb_model.ubj
+"""
+import argparse
+import pickle
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+import xgboost
+
+NATIVE_FORMATS: Tuple[str, ...] = (".json", ".ubj")
+
+
+def is_native_model(path: str) -> bool:
+    """Whether a path/URL (query string ignored) points at a JSON/UBJ model."""
+    return path.split("?", 1)[0].lower().endswith(NATIVE_FORMATS)
+
+
+def _as_booster(model: Any) -> xgboost.Booster:
+    if isinstance(model, xgboost.Booster):
+        return model
+    if hasattr(model, "get_booster"):
+        return model.get_booster()
+    raise TypeError(f"Unsupported XGBoost model type: {type(model).__name__}")
+
+
+class BoosterPredictor:
+    """Thread-safe wrapper over a native booster, validated once against the feature layout."""
+
+    def __init__(self, model: Any, feature_cols: Sequence[str], n_threads: int = 0):
+        """
+        Args:
+            model: xgboost.Booster or sklearn wrapper (XGBRegressor...)
+            feature_cols: Encoded column list the inputs are laid out in
+            n_threads: Threads per prediction call (0 = XGBoost default)
+        """
+        self.booster = _as_booster(model)
+        self.feature_names: List[str] = [str(name) for name in feature_cols]
+
+        model_names = self.booster.feature_names
+        if model_names is not None and list(model_names) != self.feature_names:
+            unexpected = sorted(set(model_names) ^ set(self.feature_names))[:10]
+            raise ValueError(
+                "Model features do not match the encoded columns "
+                f"({len(model_names)} vs {len(self.feature_names)}; differing: {unexpected})"
+            )
+        if self.booster.num_features() != len(self.feature_names):
+            raise ValueError(
+                f"Model expects {self.booster.num_features()} features, "
+                f"encoded columns have {len(self.feature_names)}"
+            )
+
+        if n_threads:
+            self.booster.set_param({"nthread": n_threads})
+
+        # Same trees as XGBRegressor.predict: stop at best_iteration when early stopping set it
+        best_iteration = self.booster.attr("best_iteration")
+        self.iteration_range = (0, int(best_iteration) + 1) if best_iteration is not None else (0, 0)
+
+    @classmethod
+    def from_file(
+        cls, path: str, feature_cols: Sequence[str], native: bool, n_threads: int = 0
+    ) -> "BoosterPredictor":
+        """
+        Load a booster from a local model file.
+
+        Args:
+            path: Local model file
+            feature_cols: Encoded column list
+            native: True for a JSON/UBJ model, False for a pickled model
+            n_threads: Threads per prediction call
+
+        Returns:
+            Validated predictor
+        """
+        if native:
+            booster = xgboost.Booster()
+            with open(path, "rb") as f:
+                booster.load_model(bytearray(f.read()))
+        else:
+            with open(path, "rb") as f:
+                booster = _as_booster(pickle.load(f))
+        return cls(booster, feature_cols, n_threads=n_threads)
+
+    def predict(self, features: Any) -> np.ndarray:
+        """
+        Predict on an encoded feature matrix.
+
+        Args:
+            features: float32 NumPy array or SciPy CSR matrix (n_rows, n_features).
+                Entries absent from a CSR matrix are treated as missing, not zero.
+
+        Returns:
+            Predictions as a 1-D array
+        """
+        return self.booster.inplace_predict(
+            features,
+            iteration_range=self.iteration_range,
+            validate_features=False,
+        )
+
+
+def export_native(pickle_path: str, output_path: str) -> None:
+    """Write the booster of a pickled model in native format (by extension: .json or .ubj)."""
+    with open(pickle_path, "rb") as f:
+        booster = _as_booster(pickle.load(f))
+    booster.save_model(output_path)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export a pickled XGBoost model to JSON/UBJ.")
+    parser.add_argument("pickle_path")
+    parser.add_argument("output_path", help="Destination file ending in .json or .ubj")
+    args = parser.parse_args(argv)
+
+    if not is_native_model(args.output_path):
+        parser.error("output_path must end in .json or .ubj")
+    export_native(args.pickle_path, args.output_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Single-flight helpers: concurrent callers with the same key share one in-flight computation
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    """State of one in-flight threaded call"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-based single flight for blocking functions"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run fn once per key at a time; concurrent callers wait for and share its outcome
+
+        Args:
+            key: Coalescing key
+            fn: Blocking callable to run
+            *args, **kwargs: Arguments for fn
+
+        Returns:
+            The result of the shared call (exceptions are re-raised in every waiter)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a call for the key is currently running"""
+        with self._lock:
+            return key in self._calls
+
+
+class AsyncSingleFlight:
+    """asyncio-based single flight for coroutines running on one event loop"""
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, "asyncio.Task[Any]"] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await fn() once per key at a time; concurrent callers await the same task
+
+        Args:
+            key: Coalescing key
+            fn: Zero-argument coroutine function
+
+        Returns:
+            The result of the shared task (exceptions are re-raised in every waiter)
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        # Shield so a cancelled waiter does not cancel the work shared with others
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a task for the key is currently running"""
+        return key in self._tasks